@@ -1,6 +1,6 @@
-from . import build, find, get, spanners, templates
+from . import build, find, get, simulationcache, spanners, templates
 from .indicators import Indicator
-from .noteserver import NoteServer
+from .noteserver import NoteServer, RangeNoteServer
 from .paths import (
     get_content_directory,
     get_score_directory,
@@ -13,10 +13,26 @@ from .postprocessors import (
     VerboseOttavaHandler,
     pad_voices_with_grace_skips,
 )
-from .queuesimulation import NotServableException, simulate_queue
+from .queuesimulation import (
+    NotServableException,
+    QueueDiscipline,
+    QueueState,
+    ServedSoundPoint,
+    SimulationMode,
+    simulate_queue,
+    simulate_queue_stream,
+    simulate_queue_with_service_log,
+    simulate_section,
+)
+from .raggedpitches import RaggedPitches
 from .scoping import Scope
-from .sequencemapper import VoiceSpecification, populate_voices_from_sequence
-from .sequences import Sequence
+from .sequencemapper import (
+    VoiceSpecification,
+    populate_voices_from_section,
+    populate_voices_from_sequence,
+)
+from .sequences import LazySequence, Sequence
+from .servicelog import ServiceLog
 from .sieves import gen_pitches_from_sieve
 from .soundpointsgenerators import (
     AtaxicSoundPointsGenerator,
@@ -31,13 +47,21 @@ __all__ = [
     "get",
     "AtaxicSoundPointsGenerator",
     "Indicator",
+    "LazySequence",
     "ManualOttavaHandler",
     "ManualSoundPointsGenerator",
     "NoteServer",
     "NotServableException",
     "OttavaHandler",
+    "QueueDiscipline",
+    "QueueState",
+    "RaggedPitches",
+    "RangeNoteServer",
     "Scope",
     "Sequence",
+    "ServedSoundPoint",
+    "ServiceLog",
+    "SimulationMode",
     "SoundPoint",
     "SoundPointsGenerator",
     "VerboseOttavaHandler",
@@ -48,8 +72,13 @@ __all__ = [
     "get_section_paths",
     "get_stylesheets_directory",
     "pad_voices_with_grace_skips",
+    "populate_voices_from_section",
     "populate_voices_from_sequence",
     "simulate_queue",
+    "simulate_queue_stream",
+    "simulate_queue_with_service_log",
+    "simulate_section",
+    "simulationcache",
     "spanners",
     "templates",
 ]
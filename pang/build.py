@@ -6,7 +6,8 @@ import subprocess
 import abjad
 
 from . import get
-from .paths import get___main___path, get_score_directory
+from .paths import _open_atomically, get___main___path, get_score_directory
+from .queuesimulation import QueueState
 from .sequencemapper import QuantizingMetadata
 
 PYTHON = "python"
@@ -49,13 +50,17 @@ def _get_last_time_signature(score) -> abjad.TimeSignature:
 
 
 def collect_metadata(
-    score: abjad.Score, quantizing_metadata_dict: dict[str, QuantizingMetadata]
+    score: abjad.Score,
+    quantizing_metadata_dict: dict[str, QuantizingMetadata],
+    queue_state: QueueState | None = None,
 ) -> dict:
     metadata = collect_scorewise_metadata(score)
     metadata["per_voice_metadata"] = {
         voice_name: quantizing_metadata.asdict()
         for voice_name, quantizing_metadata in quantizing_metadata_dict.items()
     }
+    if queue_state is not None:
+        metadata["queue_state"] = queue_state.asdict()
     return metadata
 
 
@@ -105,10 +110,25 @@ def _read_previous_metadata():
     return metadata
 
 
+def read_previous_queue_state() -> QueueState | None:
+    """
+    Returns the queue state persisted by the previous segment, if any.
+    """
+    metadata = _read_previous_metadata()
+    if metadata is None or "queue_state" not in metadata:
+        return None
+    return QueueState.from_dict(metadata["queue_state"])
+
+
 def _write_metadata(metadata, file_path):
-    with open(file_path, "w") as fp:
-        json.dump(metadata, fp, indent=4)
-        fp.write("\n")
+    """
+    Writes ``metadata`` atomically, so that a failure to serialize it leaves
+    the previous metadata as it was.
+    """
+    string = json.dumps(metadata, indent=4) + "\n"
+    file_path = pathlib.Path(file_path)
+    with _open_atomically(file_path) as fp:
+        fp.write(string)
 
 
 def persist(score, metadata):
@@ -1,50 +1,180 @@
 import abc
+import numbers
+import types
+import typing
 
 import nauert
+import numpy as np
 
+import abjad
+
+from .sequences import Sequence
 from .soundpointsgenerators import SoundPoint
 
+_REST = 0
+_INTEGER_PITCH = 1
+_FLOAT_PITCH = 2
+_SPARSE_PITCH = 3
+_PITCH_KINDS = {int: _INTEGER_PITCH, float: _FLOAT_PITCH, type(None): _REST}
+
 
 class AbstractNoteServer(abc.ABC):
     """
     Note Server.
+
+    Idle gaps shorter than ``rest_threshold`` do not become rests, but are
+    absorbed into the previous note, or into the next one at the very start.
+
+    Durations and numeric pitches are kept in growable arrays. Other pitches,
+    such as chords, and non-empty attachments are kept aside, by position.
     """
 
-    def __init__(self):
-        self._durations = []
-        self._pitches = []
-        self._attachments = []
+    def __init__(self, rest_threshold: float = 0.0) -> None:
+        self._rest_threshold = rest_threshold
+        self._length = 0
+        self._durations = np.empty(0)
+        self._pitch_values = np.empty(0)
+        self._pitch_kinds = np.empty(0, dtype=np.uint8)
+        self._sparse_pitches: dict[int, typing.Any] = {}
+        self._sparse_attachments: dict[int, typing.Any] = {}
         self._offset_instance = 0.0
+        self._q_event_sequence: nauert.QEventSequence | None = None
 
     def serve(self, curr_time: float, sound_point: SoundPoint):
         """
         Serve one note
         """
-        # TODO: model rest_threshold
-        if curr_time > self._offset_instance:
-            self._durations.append(curr_time - self._offset_instance)
-            self._pitches.append(None)
-            self._attachments.append(())
-        self._durations.append(sound_point.duration)
-        self._pitches.append(sound_point.pitch)
-        self._attachments.append(sound_point.attachments)
+        self._reserve(2)
+        duration = sound_point.duration
+        gap = curr_time - self._offset_instance
+        if gap >= self._rest_threshold and gap > 0:
+            self._append(gap, None, ())
+        elif gap > 0 and self._length:
+            self._durations[self._length - 1] += gap
+        elif gap > 0:
+            duration += gap
+        self._append(duration, sound_point.pitch, sound_point.attachments)
         self._offset_instance = curr_time + sound_point.duration
 
+    def rest(self, duration: float):
+        """
+        Rest for ``duration``, e.g. while a note from a previous section is
+        still sounding
+        """
+        if duration <= 0:
+            return
+        self._reserve(1)
+        self._append(duration, None, ())
+        self._offset_instance += duration
+
+    def _append(self, duration: float, pitch, attachments):
+        index = self._length
+        self._durations[index] = duration
+        self._pitch_kinds[index], self._pitch_values[index] = _encode_pitch(pitch)
+        if self._pitch_kinds[index] == _SPARSE_PITCH:
+            self._sparse_pitches[index] = pitch
+        if attachments:
+            self._sparse_attachments[index] = attachments
+        self._length += 1
+        self._q_event_sequence = None
+
+    def _reserve(self, additional_length: int):
+        capacity = len(self._durations)
+        if self._length + additional_length <= capacity:
+            return
+        capacity = max(2 * capacity, self._length + additional_length, 16)
+        for name in ("_durations", "_pitch_values", "_pitch_kinds"):
+            buffer = getattr(self, name)
+            grown = np.empty(capacity, dtype=buffer.dtype)
+            grown[: self._length] = buffer[: self._length]
+            setattr(self, name, grown)
+
+    def _serve_many(
+        self,
+        curr_times: np.ndarray,
+        durations: np.ndarray,
+        pitches: list,
+        attachments: dict[int, typing.Any],
+    ):
+        """
+        Serves sound points at ``curr_times``. ``attachments`` maps the
+        positions of the sound points that have any to their attachments.
+        """
+        previous_offset_instances = np.empty_like(durations)
+        previous_offset_instances[0] = self._offset_instance
+        previous_offset_instances[1:] = curr_times[:-1] + durations[:-1]
+        self._append_served(
+            np.maximum(curr_times - previous_offset_instances, 0.0),
+            durations,
+            pitches,
+            attachments,
+            curr_times[-1] + durations[-1],
+        )
+
+    def _append_served(
+        self,
+        rest_durations: np.ndarray,
+        durations: np.ndarray,
+        pitches: list,
+        attachments: dict[int, typing.Any],
+        offset_instance: float,
+    ):
+        is_absorbed = (0 < rest_durations) & (rest_durations < self._rest_threshold)
+        if is_absorbed.any():
+            durations = durations.copy()
+            durations[:-1][is_absorbed[1:]] += rest_durations[1:][is_absorbed[1:]]
+            if is_absorbed[0] and self._length:
+                self._durations[self._length - 1] += rest_durations[0]
+            elif is_absorbed[0]:
+                durations[0] += rest_durations[0]
+            rest_durations = np.where(is_absorbed, 0.0, rest_durations)
+        has_rest = rest_durations > 0
+        positions = self._length + np.arange(len(durations)) + np.cumsum(has_rest)
+        length = len(durations) + int(np.count_nonzero(has_rest))
+        self._reserve(length)
+        self._durations[positions] = durations
+        self._durations[positions[has_rest] - 1] = rest_durations[has_rest]
+        self._pitch_kinds[positions[has_rest] - 1] = _REST
+        kinds, values = _encode_pitches(pitches)
+        self._pitch_kinds[positions] = kinds
+        self._pitch_values[positions] = values
+        for index in np.flatnonzero(kinds == _SPARSE_PITCH).tolist():
+            self._sparse_pitches[int(positions[index])] = pitches[index]
+        for position, attachment in attachments.items():
+            if attachment:
+                self._sparse_attachments[int(positions[position])] = attachment
+        self._length += length
+        self._offset_instance = float(offset_instance)
+        self._q_event_sequence = None
+
     @abc.abstractmethod
     def can_serve(self, sound_point: SoundPoint) -> bool:
         raise NotImplementedError
 
+    def can_serve_many(self, sequence: Sequence) -> np.ndarray:
+        """
+        Returns a boolean mask of the sound points in ``sequence`` that this
+        server can serve. Override this to test all sound points at once.
+        """
+        return np.fromiter(
+            (self.can_serve(sound_point) for sound_point in sequence),
+            dtype=bool,
+            count=len(sequence),
+        )
+
     @property
     def attachments(self):
-        return self._attachments
+        return [
+            self._sparse_attachments.get(index, ()) for index in range(self._length)
+        ]
 
     @property
     def durations(self):
-        return self._durations
+        return self._durations[: self._length].tolist()
 
     @property
     def durations_in_millisecond(self):
-        return [duration * 1000 for duration in self._durations]
+        return (self._durations[: self._length] * 1000).tolist()
 
     @property
     def offset_instance(self):
@@ -52,20 +182,194 @@ class AbstractNoteServer(abc.ABC):
 
     @property
     def pitches(self):
-        return self._pitches
+        pitches = self._pitch_values[: self._length].astype(object)
+        kinds = self._pitch_kinds[: self._length]
+        pitches[kinds == _REST] = None
+        is_integer = kinds == _INTEGER_PITCH
+        pitches[is_integer] = self._pitch_values[: self._length][is_integer].astype(int)
+        for index, pitch in self._sparse_pitches.items():
+            pitches[index] = pitch
+        return pitches.tolist()
 
     @property
     def q_event_sequence(self):
-        assert len(self._durations) > 0
-        return nauert.QEventSequence.from_millisecond_pitch_attachment_tuples(
-            tuple(zip(self.durations_in_millisecond, self.pitches, self.attachments))
-        )
+        """
+        Returns the served notes and rests as q-events, built once until the
+        server serves again.
+        """
+        assert self._length > 0
+        if self._q_event_sequence is None:
+            self._q_event_sequence = self._make_q_event_sequence()
+        return self._q_event_sequence
+
+    def _make_q_event_sequence(self) -> nauert.QEventSequence:
+        """
+        Builds the q-events at the cumulative millisecond offsets of the served
+        notes and rests, fusing consecutive rests, like
+        ``nauert.QEventSequence.from_millisecond_pitch_attachment_tuples``.
+        """
+        milliseconds = self._durations[: self._length] * 1000
+        is_rest = self._pitch_kinds[: self._length] == _REST
+        is_fused = np.zeros(self._length, dtype=bool)
+        is_fused[1:] = is_rest[1:] & is_rest[:-1]
+        indices = np.flatnonzero(~is_fused)
+        fused_milliseconds = milliseconds[indices]
+        for position in np.flatnonzero(is_fused[indices[1:] - 1]).tolist():
+            start, stop = indices[position], indices[position + 1]
+            fused_milliseconds[position] = sum(milliseconds[start:stop].tolist())
+        if is_fused[-1]:
+            fused_milliseconds[-1] = sum(milliseconds[indices[-1] :].tolist())
+        offsets = [
+            abjad.Offset(offset)
+            for offset in np.concatenate(([0], np.cumsum(fused_milliseconds))).tolist()
+        ]
+        pitches = self.pitches
+        q_events = [
+            (
+                nauert.SilentQEvent(offset)
+                if is_rest[index]
+                else nauert.QEvent.from_offset_pitches_attachments(
+                    offset, pitches[index], self._sparse_attachments.get(index, ())
+                )
+            )
+            for offset, index in zip(offsets, indices.tolist())
+        ]
+        q_events.append(nauert.TerminalQEvent(offsets[-1]))
+        return nauert.QEventSequence(q_events)
+
+    @property
+    def rest_threshold(self):
+        return self._rest_threshold
+
+    @property
+    def sparse_attachments(self) -> types.MappingProxyType:
+        """
+        Returns a read-only mapping of the positions of the served notes and
+        rests that have attachments to their attachments.
+        """
+        return types.MappingProxyType(self._sparse_attachments)
 
     @property
     def is_empty(self):
-        return len(self._durations) == 0
+        return self._length == 0
 
 
 class NoteServer(AbstractNoteServer):
     def can_serve(self, sound_point: SoundPoint) -> bool:
         return True
+
+
+class RangeNoteServer(NoteServer):
+    """
+    Note server that serves sound points whose pitches all lie within
+    ``[lowest_pitch, highest_pitch]``.
+
+    ..  container:: example
+
+        >>> server = pang.RangeNoteServer(-5, 12)
+        >>> server.can_serve(pang.SoundPoint(0, 1, (-5, 7)))
+        True
+
+        >>> server.can_serve(pang.SoundPoint(0, 1, (7, 14)))
+        False
+
+    """
+
+    def __init__(
+        self, lowest_pitch: float, highest_pitch: float, rest_threshold: float = 0.0
+    ):
+        super().__init__(rest_threshold)
+        self._lowest_pitch = lowest_pitch
+        self._highest_pitch = highest_pitch
+
+    def can_serve(self, sound_point: SoundPoint) -> bool:
+        pitches = _get_pitches(sound_point.pitch)
+        return all(
+            self._lowest_pitch <= pitch <= self._highest_pitch for pitch in pitches
+        )
+
+    def can_serve_many(self, sequence: Sequence) -> np.ndarray:
+        lowest_pitches, highest_pitches = _get_pitch_ranges(sequence)
+        return (self._lowest_pitch <= lowest_pitches) & (
+            highest_pitches <= self._highest_pitch
+        )
+
+    @property
+    def highest_pitch(self):
+        return self._highest_pitch
+
+    @property
+    def lowest_pitch(self):
+        return self._lowest_pitch
+
+
+def _encode_pitch(pitch) -> tuple[int, float]:
+    kind = _PITCH_KINDS.get(type(pitch))
+    if kind == _REST:
+        return _REST, np.nan
+    if kind is not None:
+        return kind, float(pitch)
+    if isinstance(pitch, numbers.Integral) and not isinstance(pitch, bool):
+        return _INTEGER_PITCH, float(pitch)
+    if isinstance(pitch, numbers.Real):
+        return _FLOAT_PITCH, float(pitch)
+    return _SPARSE_PITCH, np.nan
+
+
+def _encode_pitches(pitches: list) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Encodes pitches like ``_encode_pitch``, telling integers, floats and
+    ``None`` apart by their type in one pass, and only testing the other
+    pitches one by one.
+    """
+    kinds = np.fromiter(
+        (_PITCH_KINDS.get(type(pitch), _SPARSE_PITCH) for pitch in pitches),
+        dtype=np.uint8,
+        count=len(pitches),
+    )
+    is_number = (kinds == _INTEGER_PITCH) | (kinds == _FLOAT_PITCH)
+    if is_number.all():
+        return kinds, np.array(pitches, dtype=float)
+    values = np.full(len(pitches), np.nan)
+    indices = np.flatnonzero(is_number).tolist()
+    values[indices] = [pitches[index] for index in indices]
+    for index in np.flatnonzero(kinds == _SPARSE_PITCH).tolist():
+        kinds[index], values[index] = _encode_pitch(pitches[index])
+    return kinds, values
+
+
+def _get_pitches(pitch) -> tuple:
+    """
+    Returns the pitches of a sound point: none for ``None``, as for a rest.
+    """
+    if pitch is None:
+        return ()
+    if isinstance(pitch, tuple):
+        return pitch
+    return (pitch,)
+
+
+def _get_pitch_ranges(sequence: Sequence) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the lowest and the highest pitch of each sound point. A sound point
+    without pitches gets an empty range, from infinity to minus infinity.
+    Pitches other than numbers and chords of numbers are compared one by one.
+    """
+    try:
+        ragged_pitches = sequence.ragged_pitches
+    except ValueError:
+        pass
+    else:
+        return ragged_pitches.minima, ragged_pitches.maxima
+    pitches = [_get_pitches(pitch) for pitch in sequence.pitches]
+    lowest_pitches = np.fromiter(
+        (min(pitch, default=np.inf) for pitch in pitches),
+        dtype=float,
+        count=len(pitches),
+    )
+    highest_pitches = np.fromiter(
+        (max(pitch, default=-np.inf) for pitch in pitches),
+        dtype=float,
+        count=len(pitches),
+    )
+    return lowest_pitches, highest_pitches
@@ -1,4 +1,7 @@
+import contextlib
+import os
 import pathlib
+import tempfile
 
 import __main__
 import tomlkit
@@ -49,3 +52,25 @@ def get_section_paths(sections=None):
 def get___main___path():
     file = __main__.__file__
     return pathlib.Path(file)
+
+
+@contextlib.contextmanager
+def _open_atomically(path: pathlib.Path, mode: str = "w"):
+    """
+    Opens a temporary file next to ``path``, and replaces ``path`` with it
+    once the block exits. The file gets the permissions ``open`` would give
+    it, and is removed if the block raises.
+    """
+    file_descriptor, temporary_path = tempfile.mkstemp(
+        dir=path.parent, suffix=path.suffix
+    )
+    try:
+        with os.fdopen(file_descriptor, mode) as fp:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.fchmod(fp.fileno(), 0o666 & ~umask)
+            yield fp
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
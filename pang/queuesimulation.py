@@ -1,7 +1,28 @@
+import base64
+import collections
+import concurrent.futures
+import dataclasses
+import enum
+import heapq
 import itertools
+import os
+import pathlib
+import pickle
+import typing
+from collections.abc import Callable, Iterable, Iterator
 
-from .noteserver import NoteServer
+import numpy as np
+
+from .noteserver import (
+    AbstractNoteServer,
+    NoteServer,
+    RangeNoteServer,
+    _get_pitch_ranges,
+    _get_pitches,
+)
 from .sequences import Sequence
+from .servicelog import ServiceLog
+from .simulationcache import get_simulation_key, read_simulation, write_simulation
 from .soundpointsgenerators import SoundPoint
 
 
@@ -9,29 +30,1093 @@ class NotServableException(Exception):
     pass
 
 
+class SimulationMode(enum.Enum):
+    REFERENCE = 1
+    EVENT_DRIVEN = 2
+    PARALLEL = 3
+
+
+class QueueDiscipline(enum.Enum):
+    FIFO = 1
+    LIFO = 2
+    SHORTEST_DURATION_FIRST = 3
+    LOWEST_PITCH_FIRST = 4
+    HIGHEST_PITCH_FIRST = 5
+
+
+_Discipline = QueueDiscipline | Callable[[SoundPoint], typing.Any]
+_Sequences = Sequence | tuple[Sequence, ...]
+
+
+@dataclasses.dataclass(frozen=True)
+class QueueState:
+    """
+    State of a queue at the end of a section, relative to the start of the
+    next one: how long each server is still busy for, and the sound points
+    still waiting, with their (negative) instances of arrival.
+    """
+
+    busy_durations: tuple[float, ...]
+    queued_sound_points: tuple[SoundPoint, ...] = ()
+
+    def asdict(self) -> dict:
+        """
+        Returns the state as a JSON-serializable dictionary. Attachments, such
+        as abjad indicators, are pickled and encoded in base64, and
+        ``from_dict`` unpickles them, so only read states you trust.
+        """
+        return {
+            "busy_durations": list(self.busy_durations),
+            "queued_sound_points": [
+                {
+                    "instance": sound_point.instance,
+                    "duration": sound_point.duration,
+                    "pitch": (
+                        list(sound_point.pitch)
+                        if isinstance(sound_point.pitch, tuple)
+                        else sound_point.pitch
+                    ),
+                    "attachments": (
+                        base64.b64encode(
+                            pickle.dumps(list(sound_point.attachments))
+                        ).decode("ascii")
+                        if sound_point.attachments
+                        else []
+                    ),
+                }
+                for sound_point in self.queued_sound_points
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, dictionary: dict) -> "QueueState":
+        return cls(
+            tuple(dictionary["busy_durations"]),
+            tuple(
+                SoundPoint(
+                    item["instance"],
+                    item["duration"],
+                    (
+                        tuple(item["pitch"])
+                        if isinstance(item["pitch"], list)
+                        else item["pitch"]
+                    ),
+                    (
+                        pickle.loads(base64.b64decode(item["attachments"]))
+                        if isinstance(item["attachments"], str)
+                        else item["attachments"]
+                    ),
+                )
+                for item in dictionary["queued_sound_points"]
+            ),
+        )
+
+
 def simulate_queue(
-    sequence: Sequence, servers: tuple[NoteServer, ...]
+    sequence: _Sequences,
+    servers: tuple[NoteServer, ...],
+    mode: SimulationMode = SimulationMode.EVENT_DRIVEN,
+    discipline: _Discipline = QueueDiscipline.FIFO,
+    max_workers: int | None = None,
+    cache_directory: pathlib.Path | str | None = None,
 ) -> tuple[NoteServer, ...]:
-    if not sequence._sound_points:
-        return servers
-    _validate_all_sound_points_are_servable(sequence, servers)
-    queue: list[SoundPoint] = []
-    for this_sound_point, next_sound_point in itertools.pairwise(
-        sequence._sound_points
+    """
+    Simulates a queue, in which ``servers`` serve the sound points of
+    ``sequence`` in order of arrival.
+
+    ``discipline`` decides which of the waiting sound points is served first:
+    a ``QueueDiscipline``, or a function that maps a sound point to its
+    priority, lowest first, ties being served in order of arrival.
+    ``SimulationMode.REFERENCE`` only models ``QueueDiscipline.FIFO``, and
+    every mode serves each sound point at the same time and with the same
+    server. ``SimulationMode.PARALLEL`` simulates the queue in up to
+    ``max_workers`` processes. With a ``cache_directory``, the result is cached
+    there, under the key of ``simulationcache.get_simulation_key``.
+    """
+    sequence, _ = _merge_sequences(sequence)
+    if len(sequence):
+        _simulate_queue_with_cache(
+            sequence, servers, mode, discipline, max_workers, cache_directory
+        )
+    return servers
+
+
+def simulate_queue_with_service_log(
+    sequence: _Sequences,
+    servers: tuple[NoteServer, ...],
+    mode: SimulationMode = SimulationMode.EVENT_DRIVEN,
+    discipline: _Discipline = QueueDiscipline.FIFO,
+    max_workers: int | None = None,
+    cache_directory: pathlib.Path | str | None = None,
+) -> tuple[tuple[NoteServer, ...], ServiceLog]:
+    """
+    Simulates a queue like ``simulate_queue``, and also returns a
+    ``ServiceLog`` of when and by which server each sound point was served.
+    When simulating a tuple of sequences, the service log follows their merged
+    order, and records which sequence each sound point came from.
+
+    ..  container:: example
+
+        >>> sequence_0 = pang.Sequence(
+        ...     [pang.SoundPoint(0, 1, 60), pang.SoundPoint(2, 1, 60)], 4
+        ... )
+        >>> sequence_1 = pang.Sequence(
+        ...     [pang.SoundPoint(0, 1, 72), pang.SoundPoint(1.5, 1, 72)], 4
+        ... )
+        >>> servers, service_log = pang.simulate_queue_with_service_log(
+        ...     (sequence_0, sequence_1), (pang.NoteServer(),)
+        ... )
+        >>> print(servers[0].pitches)
+        [60, 72, 72, 60]
+
+        >>> print(service_log.sources)
+        [0 1 1 0]
+
+        >>> print(service_log.for_source(1).waits)
+        [1.  0.5]
+
+    """
+    sequence, sources = _merge_sequences(sequence)
+    if len(sequence):
+        starts, server_indices = _simulate_queue_with_cache(
+            sequence, servers, mode, discipline, max_workers, cache_directory
+        )
+    else:
+        starts, server_indices = np.empty(0), np.empty(0, dtype=int)
+    return servers, ServiceLog(
+        sequence.instances_array,
+        starts,
+        starts + sequence.durations_array,
+        server_indices,
+        len(servers),
+        sources,
+    )
+
+
+def _merge_sequences(
+    sequences: _Sequences,
+) -> tuple[Sequence, np.ndarray | None]:
+    """
+    Merges sequences by instance, and returns the merged sequence with the
+    index of the sequence each sound point came from.
+    """
+    if isinstance(sequences, Sequence):
+        return sequences, None
+    merged, order = Sequence._merge([0] * len(sequences), sequences)
+    sources = np.repeat(
+        np.arange(len(sequences)), [len(sequence) for sequence in sequences]
+    )
+    return merged, sources[order]
+
+
+class ServedSoundPoint(typing.NamedTuple):
+    """
+    A sound point served by ``server`` from ``start``.
+    """
+
+    server: NoteServer
+    start: float
+    duration: float
+    pitch: typing.Any
+
+
+def simulate_queue_stream(
+    sound_points: Iterable[SoundPoint],
+    servers: tuple[NoteServer, ...],
+    discipline: _Discipline = QueueDiscipline.FIFO,
+) -> Iterator[ServedSoundPoint]:
+    """
+    Simulates the queue over sound points in time order, e.g. as they are
+    generated, and yields them as they are served, in the order in which they
+    are served.
+
+    A sound point is yielded as soon as its start is final, which is at the
+    latest when the first sound point arriving after it has been consumed, so
+    only the sound points still waiting are kept in memory. Unlike
+    ``simulate_queue``, the servers are not served, but only read for their
+    offset instances and for which sound points they can serve.
+
+    ..  container:: example
+
+        >>> sound_points = (
+        ...     pang.SoundPoint(instance, 1.5, pitch)
+        ...     for pitch, instance in enumerate([0, 1, 2, 3])
+        ... )
+        >>> servers = (pang.NoteServer(), pang.NoteServer())
+        >>> for served_sound_point in pang.simulate_queue_stream(
+        ...     sound_points, servers
+        ... ):
+        ...     print(
+        ...         servers.index(served_sound_point.server),
+        ...         served_sound_point.start,
+        ...         served_sound_point.pitch,
+        ...     )
+        0 0 0
+        1 1 1
+        0 2 2
+        1 3 3
+
+    Raises ``NotServableException`` on reaching a sound point that none of the
+    servers can serve, and ``ValueError`` on reaching a sound point that arrives
+    before the previous one.
+    """
+    eligibility_classes: dict[tuple[bool, ...], int] = {}
+    servable_server_indices: list[tuple[int, ...]] = []
+    waiting_sound_points: dict[int, SoundPoint] = {}
+
+    def arrive():
+        latest_instance = -np.inf
+        for index, sound_point in enumerate(sound_points):
+            if sound_point.instance < latest_instance:
+                raise ValueError(f"{sound_point} arrives out of time order")
+            latest_instance = sound_point.instance
+            eligibility = tuple(server.can_serve(sound_point) for server in servers)
+            if not any(eligibility):
+                raise NotServableException(f"{sound_point} is not servable")
+            if eligibility not in eligibility_classes:
+                eligibility_classes[eligibility] = len(servable_server_indices)
+                servable_server_indices.append(
+                    tuple(itertools.compress(range(len(servers)), eligibility))
+                )
+            waiting_sound_points[index] = sound_point
+            yield (
+                sound_point.instance,
+                sound_point.duration,
+                eligibility_classes[eligibility],
+                _get_priority(sound_point, discipline),
+            )
+
+    for index, start, server_index in _schedule(
+        arrive(),
+        servable_server_indices,
+        [server.offset_instance for server in servers],
+        _get_bucket_factory(discipline),
+    ):
+        sound_point = waiting_sound_points.pop(index)
+        yield ServedSoundPoint(
+            servers[server_index], start, sound_point.duration, sound_point.pitch
+        )
+
+
+def simulate_section(
+    sequence: Sequence,
+    servers: tuple[NoteServer, ...],
+    initial_state: QueueState | None = None,
+    discipline: _Discipline = QueueDiscipline.FIFO,
+) -> QueueState:
+    """
+    Simulates the queue of one section, which ends at the sequence duration,
+    and returns its state at the end of the section.
+
+    ``initial_state``, usually the state at the end of the previous section,
+    makes each server rest while it is still busy, and puts the sound points
+    still waiting at the front of the queue. Sound points that cannot start
+    before the section ends are left waiting in the returned state, instead of
+    being served.
+
+    ..  container:: example
+
+        >>> instances = [0, 1, 2, 3]
+        >>> durations = [1.5, 1.5, 1.5, 1.5]
+        >>> sound_points_generator = pang.ManualSoundPointsGenerator(
+        ...     instances=instances,
+        ...     durations=durations,
+        ... )
+        >>> sequence = pang.Sequence.from_sound_points_generator(
+        ...     sound_points_generator, 4
+        ... )
+        >>> server = pang.NoteServer()
+        >>> queue_state = pang.simulate_section(sequence, (server,))
+        >>> print(server.durations)
+        [1.5, 1.5, 1.5]
+
+        >>> queue_state
+        QueueState(busy_durations=(0.5,), queued_sound_points=(SoundPoint(instance=-1.0, duration=1.5, pitch=0, attachments=[]),))
+
+        >>> server = pang.NoteServer()
+        >>> queue_state = pang.simulate_section(sequence, (server,), queue_state)
+        >>> print(server.durations)
+        [0.5, 1.5, 1.5, 1.5]
+
+        >>> queue_state.busy_durations
+        (1.0,)
+
+    """
+    if initial_state is not None:
+        if len(initial_state.busy_durations) != len(servers):
+            raise ValueError(
+                f"{initial_state} does not have one busy duration per server"
+            )
+        for server, busy_duration in zip(servers, initial_state.busy_durations):
+            server.rest(busy_duration)
+        sequence = Sequence(
+            [*initial_state.queued_sound_points, *sequence],
+            sequence.sequence_duration,
+        )
+    if len(sequence):
+        starts, _ = _simulate_queue(
+            sequence,
+            servers,
+            SimulationMode.EVENT_DRIVEN,
+            discipline,
+            sequence.sequence_duration,
+        )
+    else:
+        starts = np.empty(0)
+    return QueueState(
+        tuple(
+            max(server.offset_instance - sequence.sequence_duration, 0.0)
+            for server in servers
+        ),
+        tuple(
+            sequence[index].shift(-sequence.sequence_duration)
+            for index in np.flatnonzero(np.isnan(starts))
+        ),
+    )
+
+
+def _simulate_queue_with_cache(
+    sequence: Sequence,
+    servers: tuple[NoteServer, ...],
+    mode: SimulationMode,
+    discipline: _Discipline,
+    max_workers: int | None,
+    cache_directory: pathlib.Path | str | None,
+) -> tuple[np.ndarray, np.ndarray]:
+    key = None
+    if cache_directory is not None:
+        key = get_simulation_key(sequence, servers, mode, discipline)
+    if cache_directory is None or key is None:
+        return _simulate_queue(
+            sequence, servers, mode, discipline, max_workers=max_workers
+        )
+    cache_directory = pathlib.Path(cache_directory)
+    cached = read_simulation(cache_directory, key)
+    if cached is None:
+        starts, server_indices = _simulate_queue(
+            sequence, servers, mode, discipline, max_workers=max_workers
+        )
+        write_simulation(cache_directory, key, starts, server_indices)
+        return starts, server_indices
+    starts, server_indices = cached
+    indices = np.argsort(starts, kind="stable")
+    _serve_by_server(
+        sequence, servers, indices, starts[indices], server_indices[indices]
+    )
+    return starts, server_indices
+
+
+def _simulate_queue(
+    sequence: Sequence,
+    servers: tuple[NoteServer, ...],
+    mode: SimulationMode,
+    discipline: _Discipline,
+    until: float = np.inf,
+    max_workers: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the instance at which each sound point starts to be served, and by
+    which server. Sound points that would start at or after ``until`` are left
+    unserved, with a start of ``nan`` and a server index of ``-1``.
+    """
+    match mode:
+        case SimulationMode.REFERENCE:
+            if discipline is not QueueDiscipline.FIFO:
+                raise ValueError(f"{mode} does not model {discipline}")
+            if until != np.inf:
+                raise ValueError(f"{mode} serves every sound point")
+            _validate_all_sound_points_are_servable(sequence, servers)
+            return _simulate_queue_by_scanning(sequence, servers)
+        case SimulationMode.EVENT_DRIVEN:
+            eligibilities = _get_eligibilities(sequence, servers)
+            if not _has_fast_path(servers, eligibilities, discipline):
+                return _simulate_queue_by_events(
+                    sequence, servers, eligibilities, discipline, until
+                )
+            elif len(servers) == 1:
+                return _simulate_single_server_queue(sequence, servers[0], until)
+            else:
+                return _simulate_identical_servers_queue(sequence, servers, until)
+        case SimulationMode.PARALLEL:
+            if until != np.inf:
+                raise ValueError(f"{mode} serves every sound point")
+            eligibilities = _get_eligibilities(sequence, servers)
+            # The fast paths beat scheduling parts in worker processes.
+            if _has_fast_path(servers, eligibilities, discipline):
+                return _simulate_queue(
+                    sequence, servers, SimulationMode.EVENT_DRIVEN, discipline
+                )
+            return _simulate_queue_in_parallel(
+                sequence, servers, eligibilities, discipline, max_workers
+            )
+    raise ValueError(mode)
+
+
+def _has_fast_path(
+    servers: tuple[NoteServer, ...], eligibilities: np.ndarray, discipline: _Discipline
+) -> bool:
+    """
+    Returns whether the sound points can be served without scheduling events:
+    first in, first out, by servers that can each serve all of them in bulk.
+    A single server then computes the whole queue in a few passes of array
+    operations. With several servers, each sound point goes to the
+    lowest-numbered free server, or to the earliest free one if all of them
+    are busy.
+    """
+    return (
+        discipline is QueueDiscipline.FIFO
+        and bool(eligibilities.all())
+        and all(_serves_in_bulk(server) for server in servers)
+    )
+
+
+def _serves_every_sound_point(server: NoteServer) -> bool:
+    return type(server).can_serve is NoteServer.can_serve and _serves_in_bulk(server)
+
+
+def _serves_in_bulk(server: NoteServer) -> bool:
+    """
+    Returns whether the server serves sound points as ``serve`` does, so that
+    they can be appended to it all at once.
+    """
+    return type(server).serve is AbstractNoteServer.serve
+
+
+def _serves_pitch_range(server: NoteServer) -> typing.TypeGuard[RangeNoteServer]:
+    return (
+        isinstance(server, RangeNoteServer)
+        and type(server).can_serve is RangeNoteServer.can_serve
+        and type(server).can_serve_many is RangeNoteServer.can_serve_many
+    )
+
+
+def _get_eligibilities(
+    sequence: Sequence, servers: tuple[NoteServer, ...]
+) -> np.ndarray:
+    """
+    Returns a boolean matrix, in which each row tells which servers can serve
+    a sound point. Each server is asked once, through ``can_serve_many``, and
+    ``RangeNoteServer`` ranges are looked up by binary search instead.
+    """
+    eligibilities = np.empty((len(sequence), len(servers)), dtype=bool)
+    range_servers = {
+        index: server
+        for index, server in enumerate(servers)
+        if _serves_pitch_range(server)
+    }
+    if range_servers:
+        eligibilities[:, list(range_servers)] = _get_pitch_range_eligibilities(
+            sequence, tuple(range_servers.values())
+        )
+    sound_points: list[SoundPoint] | None = None
+    for index, server in enumerate(servers):
+        if index in range_servers:
+            continue
+        if _serves_every_sound_point(server):
+            eligibilities[:, index] = True
+        elif type(server).can_serve_many is AbstractNoteServer.can_serve_many:
+            # Servers testing sound points one by one share the sound points.
+            if sound_points is None:
+                sound_points = list(sequence)
+            eligibilities[:, index] = np.fromiter(
+                map(server.can_serve, sound_points), dtype=bool, count=len(sequence)
+            )
+        else:
+            eligibilities[:, index] = server.can_serve_many(sequence)
+    is_servable = eligibilities.any(axis=1)
+    if not is_servable.all():
+        unservable_sound_points = [
+            sequence[index] for index in np.flatnonzero(~is_servable)
+        ]
+        raise NotServableException(f"{unservable_sound_points} are not servable")
+    return eligibilities
+
+
+def _get_pitch_range_eligibilities(
+    sequence: Sequence, servers: tuple[RangeNoteServer, ...]
+) -> np.ndarray:
+    """
+    Looks up the servers able to serve each sound point by binary search in
+    the sorted lowest and highest pitches of the servers' ranges.
+    """
+    lowest_pitches, highest_pitches = _get_pitch_ranges(sequence)
+    servers_lowest_pitches = np.array([server.lowest_pitch for server in servers])
+    servers_highest_pitches = np.array([server.highest_pitch for server in servers])
+    lowest_pitch_order = np.argsort(servers_lowest_pitches, kind="stable")
+    highest_pitch_order = np.argsort(servers_highest_pitches, kind="stable")
+    lowest_pitch_ranks = np.empty(len(servers), dtype=int)
+    lowest_pitch_ranks[lowest_pitch_order] = np.arange(len(servers))
+    highest_pitch_ranks = np.empty(len(servers), dtype=int)
+    highest_pitch_ranks[highest_pitch_order] = np.arange(len(servers))
+    number_of_low_enough_servers = np.searchsorted(
+        servers_lowest_pitches[lowest_pitch_order], lowest_pitches, side="right"
+    )
+    number_of_too_low_servers = np.searchsorted(
+        servers_highest_pitches[highest_pitch_order], highest_pitches, side="left"
+    )
+    return (lowest_pitch_ranks < number_of_low_enough_servers[:, np.newaxis]) & (
+        highest_pitch_ranks >= number_of_too_low_servers[:, np.newaxis]
+    )
+
+
+_MAXIMUM_REFINEMENTS = 8
+
+
+def _simulate_single_server_queue(
+    sequence: Sequence, server: NoteServer, until: float
+) -> tuple[np.ndarray, np.ndarray]:
+    instances = sequence.instances_array
+    durations = sequence.durations_array
+    starts, previous_offset_instances = _get_single_server_starts(
+        instances, durations, server.offset_instance
+    )
+    number_of_served = int(np.count_nonzero(starts < until))
+    if number_of_served:
+        last = number_of_served - 1
+        server._append_served(
+            np.maximum(instances - previous_offset_instances, 0.0)[:number_of_served],
+            durations[:number_of_served],
+            sequence.pitches[:number_of_served],
+            {
+                position: attachments
+                for position, attachments in sequence.sparse_attachments.items()
+                if position < number_of_served
+            },
+            starts[last] + durations[last],
+        )
+    server_indices = np.zeros(len(starts), dtype=int)
+    starts[number_of_served:] = np.nan
+    server_indices[number_of_served:] = -1
+    return starts, server_indices
+
+
+def _get_single_server_starts(
+    instances: np.ndarray, durations: np.ndarray, offset_instance: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns when each sound point starts to be served by one server, and when
+    the server is done with the previous one, exactly as serving them one by
+    one would: each start is the later of the instance and the previous start
+    plus its duration.
+    """
+    # Lindley's recursion, start = max(instance, previous offset instance),
+    # unrolled into a running maximum, guesses which sound points find the
+    # server idle. Sums of many durations round differently from the chain of
+    # starts, so the guess is checked against the chain until they agree.
+    previous_cumulative_durations = np.concatenate(([0.0], np.cumsum(durations)[:-1]))
+    idle_instances = instances - previous_cumulative_durations
+    latest_idle_instances = np.maximum.accumulate(
+        np.maximum(idle_instances, offset_instance)
+    )
+    previous_latest_idle_instances = np.concatenate(
+        ([offset_instance], latest_idle_instances[:-1])
+    )
+    is_idle = idle_instances >= previous_latest_idle_instances
+    for _ in range(_MAXIMUM_REFINEMENTS):
+        starts = _chain_starts(instances, durations, is_idle, offset_instance)
+        previous_offset_instances = np.concatenate(
+            ([offset_instance], starts[:-1] + durations[:-1])
+        )
+        chained_is_idle = instances >= previous_offset_instances
+        if np.array_equal(chained_is_idle, is_idle):
+            return starts, previous_offset_instances
+        is_idle = chained_is_idle
+    starts = np.empty(len(instances))
+    previous_offset_instances = np.empty(len(instances))
+    for index, (instance, duration) in enumerate(
+        zip(instances.tolist(), durations.tolist())
     ):
-        queue.append(this_sound_point)
-        current_time = this_sound_point.instance
-        _try_serving(servers, queue, current_time)
-        while queue and current_time < next_sound_point.instance:
-            if not _try_serving(servers, queue, current_time):
+        previous_offset_instances[index] = offset_instance
+        starts[index] = max(instance, offset_instance)
+        offset_instance = starts[index] + duration
+    return starts, previous_offset_instances
+
+
+def _chain_starts(
+    instances: np.ndarray,
+    durations: np.ndarray,
+    is_idle: np.ndarray,
+    offset_instance: float,
+) -> np.ndarray:
+    """
+    Returns the starts of sound points served one after another from each
+    sound point finding the server idle, adding durations in the same order as
+    serving them one by one does.
+    """
+    starts = np.where(is_idle, instances, np.nan)
+    if len(starts) and not is_idle[0]:
+        starts[0] = offset_instance
+    busy_indices = np.flatnonzero(~is_idle[1:]) + 1
+    if not len(busy_indices):
+        return starts
+    run_starts = busy_indices[np.diff(busy_indices, prepend=-1) != 1]
+    run_stops = busy_indices[np.append(np.diff(busy_indices) != 1, True)] + 1
+    for run_start, run_stop in zip(run_starts.tolist(), run_stops.tolist()):
+        starts[run_start - 1 : run_stop] = np.cumsum(
+            np.concatenate(
+                ([starts[run_start - 1]], durations[run_start - 1 : run_stop - 1])
+            )
+        )
+    return starts
+
+
+def _simulate_queue_by_scanning(
+    sequence: Sequence, servers: tuple[NoteServer, ...]
+) -> tuple[np.ndarray, np.ndarray]:
+    sound_points = list(sequence)
+    starts = np.empty(len(sound_points))
+    server_indices = np.empty(len(sound_points), dtype=int)
+    queue: list[int] = []
+    for this_index, next_index in itertools.pairwise(range(len(sound_points))):
+        queue.append(this_index)
+        current_time = sound_points[this_index].instance
+        _try_serving(servers, sound_points, queue, current_time, starts, server_indices)
+        while queue and current_time < sound_points[next_index].instance:
+            if not _try_serving(
+                servers, sound_points, queue, current_time, starts, server_indices
+            ):
                 current_time = _when_another_server_is_done(servers, current_time)
-    last_sound_point = sequence._sound_points[-1]
-    queue.append(last_sound_point)
-    current_time = last_sound_point.instance
+    queue.append(len(sound_points) - 1)
+    current_time = sound_points[-1].instance
     while queue:
-        if not _try_serving(servers, queue, current_time):
+        if not _try_serving(
+            servers, sound_points, queue, current_time, starts, server_indices
+        ):
             current_time = _when_another_server_is_done(servers, current_time)
-    return servers
+    return starts, server_indices
+
+
+def _simulate_identical_servers_queue(
+    sequence: Sequence, servers: tuple[NoteServer, ...], until: float
+) -> tuple[np.ndarray, np.ndarray]:
+    durations = sequence.durations_array
+    starts = np.empty_like(durations)
+    server_indices = np.empty(len(durations), dtype=int)
+    busy_servers = [
+        (server.offset_instance, server_index)
+        for server_index, server in enumerate(servers)
+    ]
+    heapq.heapify(busy_servers)
+    free_server_indices: list[int] = []
+    for index, (instance, duration) in enumerate(
+        zip(sequence.instances, durations.tolist())
+    ):
+        while busy_servers and busy_servers[0][0] <= instance:
+            heapq.heappush(free_server_indices, heapq.heappop(busy_servers)[1])
+        if free_server_indices:
+            start, server_index = instance, heapq.heappop(free_server_indices)
+        else:
+            start, server_index = heapq.heappop(busy_servers)
+        starts[index] = start
+        server_indices[index] = server_index
+        heapq.heappush(busy_servers, (start + duration, server_index))
+    is_served = starts < until
+    _serve_by_server(
+        sequence,
+        servers,
+        np.flatnonzero(is_served),
+        starts[is_served],
+        server_indices[is_served],
+    )
+    starts[~is_served] = np.nan
+    server_indices[~is_served] = -1
+    return starts, server_indices
+
+
+def _serve_by_server(
+    sequence: Sequence,
+    servers: tuple[NoteServer, ...],
+    indices: np.ndarray,
+    starts: np.ndarray,
+    server_indices: np.ndarray,
+) -> None:
+    """
+    Serves the sound points at ``indices``, which are listed in the order in
+    which they are served.
+    """
+    durations = sequence.durations_array
+    pitches = sequence.pitches
+    attachments = sequence.sparse_attachments
+    order = np.argsort(server_indices, kind="stable")
+    orders_by_server = np.split(
+        order, np.cumsum(np.bincount(server_indices, minlength=len(servers)))[:-1]
+    )
+    for server, server_order in zip(servers, orders_by_server):
+        if not len(server_order):
+            continue
+        served_indices = indices[server_order]
+        if not _serves_in_bulk(server):
+            for start, index in zip(
+                starts[server_order].tolist(), served_indices.tolist()
+            ):
+                server.serve(start, sequence[index])
+            continue
+        server._serve_many(
+            starts[server_order],
+            durations[served_indices],
+            [pitches[index] for index in served_indices],
+            (
+                {
+                    position: attachments[index]
+                    for position, index in enumerate(served_indices.tolist())
+                    if index in attachments
+                }
+                if attachments
+                else {}
+            ),
+        )
+
+
+def _simulate_queue_by_events(
+    sequence: Sequence,
+    servers: tuple[NoteServer, ...],
+    eligibilities: np.ndarray,
+    discipline: _Discipline,
+    until: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Keeps the servers' offset instances in a priority queue and the waiting
+    sound points in buckets of servers able to serve them, instead of
+    rescanning the whole queue on every attempt to serve as
+    ``_simulate_queue_by_scanning`` does.
+    """
+    eligibility_rows, eligibility_classes = np.unique(
+        eligibilities, axis=0, return_inverse=True
+    )
+    scheduled = np.array(
+        list(
+            itertools.takewhile(
+                lambda served: served[1] < until,
+                _schedule(
+                    zip(
+                        sequence.instances,
+                        sequence.durations,
+                        eligibility_classes.ravel().tolist(),
+                        _get_priorities(sequence, discipline),
+                    ),
+                    [tuple(np.flatnonzero(row).tolist()) for row in eligibility_rows],
+                    [server.offset_instance for server in servers],
+                    _get_bucket_factory(discipline),
+                ),
+            )
+        )
+    ).reshape(-1, 3)
+    indices = scheduled[:, 0].astype(int)
+    served_server_indices = scheduled[:, 2].astype(int)
+    _serve_by_server(sequence, servers, indices, scheduled[:, 1], served_server_indices)
+    starts = np.full(len(sequence), np.nan)
+    starts[indices] = scheduled[:, 1]
+    server_indices = np.full(len(sequence), -1)
+    server_indices[indices] = served_server_indices
+    return starts, server_indices
+
+
+class _FirstInFirstOutBucket:
+    def __init__(self) -> None:
+        self._indices: collections.deque[int] = collections.deque()
+
+    def __len__(self):
+        return len(self._indices)
+
+    def peek(self):
+        return self._indices[0]
+
+    def pop(self) -> int:
+        return self._indices.popleft()
+
+    def push(self, index: int, priority: typing.Any = None) -> None:
+        self._indices.append(index)
+
+
+class _LastInFirstOutBucket:
+    def __init__(self) -> None:
+        self._indices: list[int] = []
+
+    def __len__(self):
+        return len(self._indices)
+
+    def peek(self):
+        return -self._indices[-1]
+
+    def pop(self) -> int:
+        return self._indices.pop()
+
+    def push(self, index: int, priority: typing.Any = None) -> None:
+        self._indices.append(index)
+
+
+class _PriorityBucket:
+    def __init__(self) -> None:
+        self._heap: list[tuple[typing.Any, int]] = []
+
+    def __len__(self):
+        return len(self._heap)
+
+    def peek(self):
+        return self._heap[0]
+
+    def pop(self) -> int:
+        return heapq.heappop(self._heap)[1]
+
+    def push(self, index: int, priority: typing.Any = None) -> None:
+        heapq.heappush(self._heap, (priority, index))
+
+
+_Bucket = _FirstInFirstOutBucket | _LastInFirstOutBucket | _PriorityBucket
+
+
+def _get_bucket_factory(discipline: _Discipline) -> Callable[[], _Bucket]:
+    match discipline:
+        case QueueDiscipline.FIFO:
+            return _FirstInFirstOutBucket
+        case QueueDiscipline.LIFO:
+            return _LastInFirstOutBucket
+        case _:
+            return _PriorityBucket
+
+
+def _get_priorities(sequence: Sequence, discipline: _Discipline) -> list:
+    match discipline:
+        case QueueDiscipline.FIFO | QueueDiscipline.LIFO:
+            return [None] * len(sequence)
+        case QueueDiscipline.SHORTEST_DURATION_FIRST:
+            return sequence.durations
+        case QueueDiscipline.LOWEST_PITCH_FIRST:
+            return _get_pitch_ranges(sequence)[0].tolist()
+        case QueueDiscipline.HIGHEST_PITCH_FIRST:
+            return (-_get_pitch_ranges(sequence)[1]).tolist()
+        case _:
+            return [discipline(sound_point) for sound_point in sequence]
+
+
+def _get_priority(sound_point: SoundPoint, discipline: _Discipline) -> typing.Any:
+    match discipline:
+        case QueueDiscipline.FIFO | QueueDiscipline.LIFO:
+            return None
+        case QueueDiscipline.SHORTEST_DURATION_FIRST:
+            return sound_point.duration
+        case QueueDiscipline.LOWEST_PITCH_FIRST:
+            return min(_get_pitches(sound_point.pitch), default=np.inf)
+        case QueueDiscipline.HIGHEST_PITCH_FIRST:
+            return -max(_get_pitches(sound_point.pitch), default=-np.inf)
+        case _:
+            return discipline(sound_point)
+
+
+def _schedule(
+    arrivals: Iterable[tuple[float, float, int, typing.Any]],
+    servable_server_indices: list[tuple[int, ...]],
+    offset_instances: list[float],
+    make_bucket: Callable[[], _Bucket] = _FirstInFirstOutBucket,
+) -> Iterator[tuple[int, float, int]]:
+    """
+    Yields ``(index, start, server_index)`` for every arrival, in the order in
+    which they are served, as soon as it is final. Arrivals are
+    ``(instance, duration, eligibility_class, priority)`` in time order, and are
+    consumed lazily, one past the latest instance served so far.
+    ``servable_server_indices`` lists the servers able to serve the sound
+    points of each eligibility class. Each class waits in a bucket made by
+    ``make_bucket``, whose ``peek`` returns the priority of the sound point it
+    would pop next, lowest first.
+    """
+    busy_servers = [
+        (offset_instance, server_index)
+        for server_index, offset_instance in enumerate(offset_instances)
+    ]
+    heapq.heapify(busy_servers)
+    is_free = [False] * len(offset_instances)
+    waiting: dict[int, _Bucket] = {}
+    waiting_durations: dict[int, float] = {}
+
+    def release(time):
+        while busy_servers and busy_servers[0][0] <= time:
+            _, server_index = heapq.heappop(busy_servers)
+            is_free[server_index] = True
+
+    def serve(time):
+        while waiting_durations:
+            release(time)
+            earliest_class = None
+            for eligibility_class, bucket in waiting.items():
+                if earliest_class is not None and (
+                    waiting[earliest_class].peek() < bucket.peek()
+                ):
+                    continue
+                if any(
+                    is_free[server_index]
+                    for server_index in servable_server_indices[eligibility_class]
+                ):
+                    earliest_class = eligibility_class
+            if earliest_class is None:
+                return
+            bucket = waiting[earliest_class]
+            index = bucket.pop()
+            if not bucket:
+                del waiting[earliest_class]
+            server_index = next(
+                server_index
+                for server_index in servable_server_indices[earliest_class]
+                if is_free[server_index]
+            )
+            is_free[server_index] = False
+            heapq.heappush(
+                busy_servers, (time + waiting_durations.pop(index), server_index)
+            )
+            yield index, time, server_index
+
+    enumerated_arrivals = enumerate(arrivals)
+    arrival = next(enumerated_arrivals, None)
+    while arrival is not None:
+        time = arrival[1][0]
+        while waiting_durations and busy_servers and busy_servers[0][0] < time:
+            yield from serve(busy_servers[0][0])
+        release(time)
+        while arrival is not None and arrival[1][0] == time:
+            index, (_, duration, eligibility_class, priority) = arrival
+            if eligibility_class not in waiting:
+                waiting[eligibility_class] = make_bucket()
+            waiting[eligibility_class].push(index, priority)
+            waiting_durations[index] = duration
+            arrival = next(enumerated_arrivals, None)
+        yield from serve(time)
+    while waiting_durations:
+        yield from serve(busy_servers[0][0])
+
+
+def _simulate_queue_in_parallel(
+    sequence: Sequence,
+    servers: tuple[NoteServer, ...],
+    eligibilities: np.ndarray,
+    discipline: _Discipline,
+    max_workers: int | None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Splits the sequence where every server is certainly idle and the queue is
+    certainly empty, since no sound point arriving after such a point is
+    affected by those arriving before it. The parts are simulated by events in
+    up to ``max_workers`` processes, which defaults to the number of
+    processors, and their results are put back together in order. The idle
+    points are found by bounding the queue with a single server that does all
+    of the work, so sparse sequences split well and dense ones may not split at
+    all.
+    """
+    offset_instances = [server.offset_instance for server in servers]
+    number_of_workers = max_workers or os.cpu_count() or 1
+    split_indices = _balance_split_indices(
+        _get_idle_split_indices(
+            sequence.instances_array,
+            sequence.durations_array,
+            offset_instances,
+        ),
+        len(sequence),
+        4 * number_of_workers,
+    ).tolist()
+    eligibility_rows, eligibility_classes = np.unique(
+        eligibilities, axis=0, return_inverse=True
+    )
+    instances = sequence.instances_array
+    durations = sequence.durations_array
+    eligibility_classes = eligibility_classes.ravel()
+    priorities = (
+        None
+        if discipline in (QueueDiscipline.FIFO, QueueDiscipline.LIFO)
+        else _get_priorities(sequence, discipline)
+    )
+    servable_server_indices = [
+        tuple(np.flatnonzero(row).tolist()) for row in eligibility_rows
+    ]
+    arguments = (
+        (
+            instances[start:stop],
+            durations[start:stop],
+            eligibility_classes[start:stop],
+            None if priorities is None else priorities[start:stop],
+            servable_server_indices,
+            offset_instances,
+            _get_bucket_factory(discipline),
+        )
+        for start, stop in itertools.pairwise([0, *split_indices, len(sequence)])
+    )
+    if number_of_workers == 1 or not split_indices:
+        scheduled_parts = list(itertools.starmap(_schedule_part, arguments))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(number_of_workers) as executor:
+            scheduled_parts = list(executor.map(_schedule_part, *zip(*arguments)))
+    for scheduled, first_index in zip(scheduled_parts[1:], split_indices):
+        scheduled[:, 0] += first_index
+    scheduled = np.concatenate(scheduled_parts)
+    indices = scheduled[:, 0].astype(int)
+    served_server_indices = scheduled[:, 2].astype(int)
+    _serve_by_server(sequence, servers, indices, scheduled[:, 1], served_server_indices)
+    starts = np.empty(len(sequence))
+    starts[indices] = scheduled[:, 1]
+    server_indices = np.empty(len(sequence), dtype=int)
+    server_indices[indices] = served_server_indices
+    return starts, server_indices
+
+
+def _get_idle_split_indices(
+    instances: np.ndarray, durations: np.ndarray, offset_instances: list[float]
+) -> np.ndarray:
+    """
+    Returns the indices of the sound points on whose arrival every server is
+    idle and the queue is empty.
+
+    While a sound point is waiting, at least one server is busy, so the servers
+    do work at least as fast as a single server doing all of it, starting with
+    the work left before the first arrival. Whenever that single server would
+    be idle, so would every server. A small margin guards against the two
+    accumulating rounding errors differently.
+    """
+    first_instance = instances[0]
+    initial_latest_end = first_instance + sum(
+        max(offset_instance - first_instance, 0.0)
+        for offset_instance in offset_instances
+    )
+    cumulative_durations = np.cumsum(durations)
+    previous_cumulative_durations = cumulative_durations - durations
+    latest_ends = cumulative_durations + np.maximum(
+        np.maximum.accumulate(instances - previous_cumulative_durations),
+        initial_latest_end,
+    )
+    margins = 1e-9 * np.maximum(np.abs(latest_ends[:-1]), 1.0)
+    return np.flatnonzero(instances[1:] > latest_ends[:-1] + margins) + 1
+
+
+def _balance_split_indices(
+    split_indices: np.ndarray, length: int, number_of_parts: int
+) -> np.ndarray:
+    if not len(split_indices):
+        return split_indices
+    targets = np.linspace(0, length, number_of_parts + 1)[1:-1]
+    nearest = np.searchsorted(split_indices, targets).clip(max=len(split_indices) - 1)
+    return np.unique(split_indices[nearest])
+
+
+def _schedule_part(
+    instances: np.ndarray,
+    durations: np.ndarray,
+    eligibility_classes: np.ndarray,
+    priorities: list | None,
+    servable_server_indices: list[tuple[int, ...]],
+    offset_instances: list[float],
+    make_bucket: Callable[[], _Bucket],
+) -> np.ndarray:
+    """
+    Schedules a part of the arrivals, which are sent to worker processes by
+    column.
+    """
+    arrivals = zip(
+        instances.tolist(),
+        durations.tolist(),
+        eligibility_classes.tolist(),
+        itertools.repeat(None) if priorities is None else priorities,
+    )
+    return np.array(
+        list(
+            _schedule(arrivals, servable_server_indices, offset_instances, make_bucket)
+        )
+    ).reshape(-1, 3)
 
 
 def _validate_all_sound_points_are_servable(
@@ -47,13 +1132,22 @@ def _validate_all_sound_points_are_servable(
 
 
 def _try_serving(
-    servers: tuple[NoteServer, ...], queue: list[SoundPoint], current_time: float
+    servers: tuple[NoteServer, ...],
+    sound_points: list[SoundPoint],
+    queue: list[int],
+    current_time: float,
+    starts: np.ndarray,
+    server_indices: np.ndarray,
 ) -> bool:
-    for index, sound_point in enumerate(queue):
+    for index, sound_point_index in enumerate(queue):
         available_servers = _get_all_available_servers(servers, current_time)
-        servable_servers = _get_all_servable_servers(available_servers, sound_point)
+        servable_servers = _get_all_servable_servers(
+            available_servers, sound_points[sound_point_index]
+        )
         if servable_servers:
-            servable_servers[0].serve(current_time, queue.pop(index))
+            servable_servers[0].serve(current_time, sound_points[queue.pop(index)])
+            starts[sound_point_index] = current_time
+            server_indices[sound_point_index] = servers.index(servable_servers[0])
             return True
     return False
 
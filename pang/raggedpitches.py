@@ -0,0 +1,156 @@
+import dataclasses
+import numbers
+from collections.abc import Sequence
+
+import numpy as np
+
+_NUMBER_TYPES = (float, int)
+
+
+@dataclasses.dataclass(eq=False, frozen=True)
+class RaggedPitches:
+    """
+    Pitches of sound points, flattened into one array of numbers.
+
+    The pitches of sound point ``i`` are ``values[offsets[i]:offsets[i + 1]]``.
+    ``is_chord`` tells a chord of one pitch from a single pitch. A sound point
+    without pitch, ``None``, has no numbers and is not a chord.
+
+    ..  container:: example
+
+        >>> ragged_pitches = pang.RaggedPitches.from_pitches([0, (2, 7), None, ()])
+        >>> ragged_pitches.values
+        array([0., 2., 7.])
+
+        >>> ragged_pitches.offsets
+        array([0, 1, 3, 3, 3])
+
+        >>> ragged_pitches.chord_sizes
+        array([1, 2, 0, 0])
+
+        >>> ragged_pitches.transpose(12).to_pitches()
+        [12, (14, 19), None, ()]
+
+    """
+
+    values: np.ndarray
+    offsets: np.ndarray
+    is_chord: np.ndarray
+
+    def __eq__(self, ragged_pitches):
+        if not isinstance(ragged_pitches, type(self)):
+            return NotImplemented
+        return all(
+            np.array_equal(
+                getattr(self, field.name), getattr(ragged_pitches, field.name)
+            )
+            for field in dataclasses.fields(self)
+        )
+
+    def __len__(self):
+        return len(self.is_chord)
+
+    def to_pitches(self) -> list:
+        """
+        Returns the pitches as a sequence keeps them. Whole numbers become
+        integers.
+        """
+        values = [
+            int(value) if value.is_integer() else value
+            for value in self.values.tolist()
+        ]
+        if not self.is_chord.any() and len(values) == len(self):
+            return values
+        pitches: list = []
+        for start, stop, is_chord in zip(
+            self.offsets[:-1].tolist(),
+            self.offsets[1:].tolist(),
+            self.is_chord.tolist(),
+        ):
+            if is_chord:
+                pitches.append(tuple(values[start:stop]))
+            elif start == stop:
+                pitches.append(None)
+            else:
+                pitches.append(values[start])
+        return pitches
+
+    def transpose(self, interval) -> "RaggedPitches":
+        """
+        Transposes all pitches by ``interval``, or the pitches of each sound
+        point by its own interval if ``interval`` is an array.
+        """
+        interval = np.asarray(interval, dtype=float)
+        if interval.ndim:
+            interval = np.repeat(interval, self.chord_sizes)
+        return dataclasses.replace(self, values=self.values + interval)
+
+    def within(self, lowest_pitch: float, highest_pitch: float) -> np.ndarray:
+        """
+        Returns a boolean mask of the sound points whose pitches all lie
+        within ``[lowest_pitch, highest_pitch]``.
+        """
+        return (lowest_pitch <= self.minima) & (self.maxima <= highest_pitch)
+
+    @property
+    def chord_sizes(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @property
+    def maxima(self) -> np.ndarray:
+        """
+        Returns the highest pitch of each sound point, or minus infinity
+        without pitches.
+        """
+        return self._reduce(np.maximum, -np.inf)
+
+    @property
+    def minima(self) -> np.ndarray:
+        """
+        Returns the lowest pitch of each sound point, or infinity without
+        pitches.
+        """
+        return self._reduce(np.minimum, np.inf)
+
+    def _reduce(self, function: np.ufunc, empty_value: float) -> np.ndarray:
+        result = np.full(len(self), empty_value)
+        has_pitches = self.chord_sizes > 0
+        if has_pitches.any():
+            result[has_pitches] = function.reduceat(
+                self.values, self.offsets[:-1][has_pitches]
+            )
+        return result
+
+    @classmethod
+    def from_pitches(cls, pitches: Sequence) -> "RaggedPitches":
+        """
+        Makes ragged pitches from numbers, tuples of numbers and ``None``.
+        """
+        is_chord = []
+        chord_sizes = []
+        values: list = []
+        for pitch in pitches:
+            if type(pitch) in _NUMBER_TYPES or _is_number(pitch):
+                is_chord.append(False)
+                chord_sizes.append(1)
+                values.append(pitch)
+            elif isinstance(pitch, tuple) and all(
+                type(_) in _NUMBER_TYPES or _is_number(_) for _ in pitch
+            ):
+                is_chord.append(True)
+                chord_sizes.append(len(pitch))
+                values.extend(pitch)
+            elif pitch is None:
+                is_chord.append(False)
+                chord_sizes.append(0)
+            else:
+                raise ValueError(f"Pitch {pitch!r} is not a number or a chord")
+        offsets = np.zeros(len(pitches) + 1, dtype=np.int64)
+        np.cumsum(chord_sizes, out=offsets[1:])
+        return cls(
+            np.array(values, dtype=float), offsets, np.array(is_chord, dtype=bool)
+        )
+
+
+def _is_number(pitch) -> bool:
+    return isinstance(pitch, numbers.Real) and not isinstance(pitch, bool)
@@ -1,4 +1,5 @@
 import dataclasses
+import pathlib
 
 import nauert
 
@@ -6,8 +7,8 @@ import abjad
 
 from .aligner import align_voices_length
 from .noteserver import NoteServer
-from .queuesimulation import simulate_queue
-from .sequences import Sequence
+from .queuesimulation import QueueState, simulate_queue, simulate_section
+from .sequences import LazySequence, Sequence, _materialize
 
 
 @dataclasses.dataclass(frozen=True)
@@ -45,15 +46,50 @@ class VoiceSpecification:
 
 
 def populate_voices_from_sequence(
-    sequence: Sequence, voice_specifications: tuple[VoiceSpecification, ...]
+    sequence: Sequence | LazySequence,
+    voice_specifications: tuple[VoiceSpecification, ...],
+    cache_directory: pathlib.Path | str | None = None,
 ) -> dict[str, QuantizingMetadata]:
+    """
+    Simulates the queue of ``sequence`` and quantizes what each note server
+    served into its voice. See ``simulate_queue`` for ``cache_directory``. A
+    lazy sequence is materialized first.
+    """
     simulate_queue(
-        sequence,
+        _materialize(sequence),
         tuple(
             voice_specification.note_server
             for voice_specification in voice_specifications
         ),
+        cache_directory=cache_directory,
     )
+    return _quantize_voices(voice_specifications)
+
+
+def populate_voices_from_section(
+    sequence: Sequence | LazySequence,
+    voice_specifications: tuple[VoiceSpecification, ...],
+    initial_queue_state: QueueState | None = None,
+) -> tuple[dict[str, QuantizingMetadata], QueueState]:
+    """
+    Like ``populate_voices_from_sequence``, but continues the queue from
+    ``initial_queue_state``, and returns the queue state at the end of the
+    section along with the quantizing metadata.
+    """
+    queue_state = simulate_section(
+        _materialize(sequence),
+        tuple(
+            voice_specification.note_server
+            for voice_specification in voice_specifications
+        ),
+        initial_queue_state,
+    )
+    return _quantize_voices(voice_specifications), queue_state
+
+
+def _quantize_voices(
+    voice_specifications: tuple[VoiceSpecification, ...],
+) -> dict[str, QuantizingMetadata]:
     for voice_specification in voice_specifications:
         if voice_specification.note_server.is_empty:
             continue
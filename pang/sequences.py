@@ -1,50 +1,275 @@
 import bisect
+import hashlib
 import itertools
+import json
+import numbers
+import pathlib
+import pickle
+import types
+import typing
 from collections.abc import Iterable
 
-from .soundpointsgenerators import SoundPoint, SoundPointsGenerator
+import numpy as np
+
+from .paths import _open_atomically
+from .raggedpitches import RaggedPitches, _is_number
+from .soundpointsgenerators import _NO_ATTACHMENTS, SoundPoint, SoundPointsGenerator
 
 
 class Sequence:
     """
     Sequence of sound-points.
+
+    Sound points are kept by column: instances and durations in float arrays,
+    pitches in a list, or in the columns they were saved in when loaded, and
+    non-empty attachments by position. A
+    ``SoundPoint`` is only made when the sequence is indexed or iterated over.
+
+    ``extend``, ``insert`` and ``from_sequences`` only record which pieces of
+    which columns go where, and with which offsets, so they cost time in the
+    number of pieces rather than of sound points. The pieces are put together
+    once, when the columns are next needed. The offset of each edit is added
+    to the instances in turn, so they round as if each edit had been carried
+    out at once.
+
+    ..  container:: example
+
+        >>> sequence = pang.Sequence.from_arrays(
+        ...     [0, 1, 1.5], [1, 0.5, 0.5], 2, pitches=[0, (2, 3), 4]
+        ... )
+        >>> sequence.instances_array
+        array([0. , 1. , 1.5])
+
+        >>> sequence[1]
+        SoundPoint(instance=1.0, duration=0.5, pitch=(2, 3), attachments=[])
+
     """
 
+    _fingerprint: tuple[list | None, str] = (None, "")
+    _end_index: tuple[np.ndarray | None, tuple[np.ndarray, ...]] = (None, ())
+    _ragged_pitches: tuple[typing.Sequence | None, RaggedPitches | None] = (
+        None,
+        None,
+    )
+
     def __init__(
         self,
         sound_points: list[SoundPoint],
         sequence_duration: float,
     ):
-        self._sound_points = sound_points
-        if any(
-            s0.instance > s1.instance
-            for s0, s1 in itertools.pairwise(self._sound_points)
-        ):
-            raise ValueError("Sound points are out of order")
-        if sound_points and sound_points[-1].instance > sequence_duration:
-            raise ValueError("The last sound point starts after the sequence ended")
+        self._set_columns(
+            np.fromiter(
+                (sound_point.instance for sound_point in sound_points),
+                dtype=float,
+                count=len(sound_points),
+            ),
+            np.fromiter(
+                (sound_point.duration for sound_point in sound_points),
+                dtype=float,
+                count=len(sound_points),
+            ),
+            [sound_point.pitch for sound_point in sound_points],
+            {
+                index: sound_point.attachments
+                for index, sound_point in enumerate(sound_points)
+                if sound_point.attachments
+            },
+        )
         self._sequence_duration = sequence_duration
+        self._validate()
 
-    def __getitem__(self, index) -> SoundPoint:
-        return self._sound_points[index]
+    def __getitem__(self, index):
+        instances, durations, pitches, attachments = self._get_columns()
+        if isinstance(index, slice):
+            positions = range(len(instances))[index]
+            return [
+                SoundPoint(
+                    instance,
+                    duration,
+                    pitch,
+                    attachments.get(position, _NO_ATTACHMENTS),
+                )
+                for position, instance, duration, pitch in zip(
+                    positions,
+                    instances[index].tolist(),
+                    durations[index].tolist(),
+                    pitches[index],
+                )
+            ]
+        index = range(len(instances))[index]
+        return SoundPoint(
+            float(instances[index]),
+            float(durations[index]),
+            pitches[index],
+            attachments.get(index, _NO_ATTACHMENTS),
+        )
 
     def __eq__(self, sequence):
         return (
-            self._sound_points == sequence._sound_points
+            np.array_equal(self._instances, sequence._instances)
+            and np.array_equal(self._durations, sequence._durations)
+            and self._pitches == sequence._pitches
+            and self._attachments == sequence._attachments
             and self._sequence_duration == sequence._sequence_duration
         )
 
     def __len__(self):
-        return len(self._sound_points)
+        return sum(piece.stop - piece.start for piece in self._pieces)
 
     def __repr__(self):
         """
         Gets interpreter representation.
         """
-        return f"{type(self).__name__}(sound_points={self._sound_points!r}, sequence_duration={self._sequence_duration!r})"
+        return f"{type(self).__name__}(sound_points={self[:]!r}, sequence_duration={self._sequence_duration!r})"
 
     def __iter__(self):
-        yield from self._sound_points
+        instances, durations, pitches, attachments = self._get_columns()
+        for position, (instance, duration, pitch) in enumerate(
+            zip(instances.tolist(), durations.tolist(), pitches)
+        ):
+            yield SoundPoint(
+                instance,
+                duration,
+                pitch,
+                attachments.get(position, _NO_ATTACHMENTS),
+            )
+
+    def _validate(self) -> None:
+        """
+        Validates the order of the sound points piece by piece, since adding an
+        offset to ordered instances keeps them in order.
+        """
+        pieces = [piece for piece in self._pieces if piece.start < piece.stop]
+        for piece in pieces:
+            instances = piece.columns[0][piece.start : piece.stop]
+            if np.any(instances[1:] < instances[:-1]):
+                raise ValueError("Sound points are out of order")
+        for piece, next_piece in itertools.pairwise(pieces):
+            if next_piece.get_instance(next_piece.start) < piece.get_instance(
+                piece.stop - 1
+            ):
+                raise ValueError("Sound points are out of order")
+        if pieces and (
+            pieces[-1].get_instance(pieces[-1].stop - 1) > self._sequence_duration
+        ):
+            raise ValueError("The last sound point starts after the sequence ended")
+
+    @property
+    def _attachments(self) -> dict[int, typing.Any]:
+        return self._get_columns()[3]
+
+    @property
+    def _durations(self) -> np.ndarray:
+        return self._get_columns()[1]
+
+    @property
+    def _instances(self) -> np.ndarray:
+        return self._get_columns()[0]
+
+    @property
+    def _pitches(self) -> typing.Sequence:
+        return self._get_columns()[2]
+
+    def _get_columns(self) -> tuple[np.ndarray, np.ndarray, typing.Sequence, dict]:
+        if len(self._pieces) == 1 and self._pieces[0].is_whole():
+            return self._pieces[0].columns
+        columns = [piece.get_columns() for piece in self._pieces]
+        attachments: dict[int, typing.Any] = {}
+        length = 0
+        for piece_instances, _, _, piece_attachments in columns:
+            attachments.update(_shift_keys(piece_attachments, length))
+            length += len(piece_instances)
+        pieces = self._pieces
+        self._set_columns(
+            np.concatenate([instances for instances, _, _, _ in columns]),
+            np.concatenate([durations for _, durations, _, _ in columns]),
+            [pitch for _, _, pitches, _ in columns for pitch in pitches],
+            attachments,
+        )
+        # Putting the pieces together leaves the content as it was.
+        if self._fingerprint[0] is pieces:
+            self._fingerprint = (self._pieces, self._fingerprint[1])
+        return self._pieces[0].columns
+
+    def _get_end_index(self) -> tuple[np.ndarray, ...]:
+        """
+        Returns the ends of the sound points, their running maximum, and the
+        latest end in each block of ``_END_BLOCK_SIZE`` sound points, which are
+        kept until the sequence is changed.
+        """
+        instances, durations, _, _ = self._get_columns()
+        if self._end_index[0] is not instances:
+            ends = instances + durations
+            block_ends = (
+                np.maximum.reduceat(ends, np.arange(0, len(ends), _END_BLOCK_SIZE))
+                if len(ends)
+                else ends
+            )
+            self._end_index = (
+                instances,
+                (ends, np.maximum.accumulate(ends), block_ends),
+            )
+        return self._end_index[1]
+
+    def _set_columns(
+        self,
+        instances: np.ndarray,
+        durations: np.ndarray,
+        pitches: typing.Sequence,
+        attachments: dict[int, typing.Any],
+    ) -> None:
+        self._pieces: list[_Piece] = [
+            _Piece((instances, durations, pitches, attachments), 0, len(instances))
+        ]
+
+    def _split_pieces(self, offset: float) -> tuple[list["_Piece"], list["_Piece"]]:
+        """
+        Splits the pieces before the first sound point at or after ``offset``.
+        """
+        for index, piece in enumerate(self._pieces):
+            if piece.start == piece.stop or piece.get_instance(piece.stop - 1) < offset:
+                continue
+            split = bisect.bisect_left(
+                range(piece.start, piece.stop), offset, key=piece.get_instance
+            )
+            return (
+                [*self._pieces[:index], piece._replace(stop=piece.start + split)],
+                [piece._replace(start=piece.start + split), *self._pieces[index + 1 :]],
+            )
+        return list(self._pieces), []
+
+    def at(self, time: float) -> list[SoundPoint]:
+        """
+        Gets the sound points sounding at ``time``, in seconds: those starting
+        at or before it and ending after it. The sound points before the first
+        one whose running maximum of ends is after ``time`` have all ended, and
+        are skipped by bisection. After that, only the blocks of sound points
+        whose latest end is after ``time`` are looked at, so a long sound point
+        does not make every sound point starting while it sounds be looked at.
+
+        ..  container:: example
+
+            >>> sequence = pang.Sequence.from_arrays(
+            ...     [0, 1, 1.5, 3], [2, 1, 0.5, 1], 4, pitches=[0, 1, 2, 3]
+            ... )
+            >>> for sound_point in sequence.at(1.5):
+            ...     sound_point
+            ...
+            SoundPoint(instance=0.0, duration=2.0, pitch=0, attachments=[])
+            SoundPoint(instance=1.0, duration=1.0, pitch=1, attachments=[])
+            SoundPoint(instance=1.5, duration=0.5, pitch=2, attachments=[])
+
+        """
+        ends, running_ends, block_ends = self._get_end_index()
+        start = int(np.searchsorted(running_ends, time, side="right"))
+        stop = int(np.searchsorted(self._instances, time, side="right"))
+        first_block = start // _END_BLOCK_SIZE
+        blocks = first_block + np.flatnonzero(
+            block_ends[first_block : -(-stop // _END_BLOCK_SIZE)] > time
+        )
+        indices = (blocks[:, np.newaxis] * _END_BLOCK_SIZE + _END_BLOCK_OFFSETS).ravel()
+        indices = indices[(start <= indices) & (indices < stop)]
+        return [self[index] for index in indices[ends[indices] > time].tolist()]
 
     def extend(self, sequence: "Sequence", time_gap=0) -> None:
         """
@@ -66,7 +291,7 @@ class Sequence:
             ... )
             >>> sequence_0.extend(sequence_1)
             >>> print(sequence_0.instances)
-            [0, 1, 2, 3, 4, 5, 6, 7]
+            [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]
 
             >>> print(sequence_0.durations)
             [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5]
@@ -74,16 +299,48 @@ class Sequence:
         """
         assert isinstance(sequence, type(self))
         offset = self._sequence_duration + time_gap
-        self._sound_points.extend(
-            [
-                SoundPoint.from_sound_point(
-                    sound_point, instance=sound_point.instance + offset
-                )
-                for sound_point in sequence
-            ]
-        )
+        self._pieces = self._pieces + [
+            piece.shift(offset) for piece in sequence._pieces
+        ]
         self._sequence_duration += sequence._sequence_duration + time_gap
 
+    def fingerprint(self) -> str:
+        """
+        Gets a digest of the instances, durations, pitches, attachments and
+        duration of the sequence, which is the same across runs for the same
+        content. Attachments and pitches other than numbers or chords of
+        numbers are digested by their representation. The digest is kept
+        until the sequence is changed.
+
+        ..  container:: example
+
+            >>> sequence_0 = pang.Sequence.from_arrays([0, 1], [1, 1], 2)
+            >>> sequence_1 = pang.Sequence.from_arrays([0, 1], [1, 1], 2)
+            >>> sequence_0.fingerprint() == sequence_1.fingerprint()
+            True
+
+            >>> sequence_1.extend(sequence_0)
+            >>> sequence_0.fingerprint() == sequence_1.fingerprint()
+            False
+
+        """
+        if self._fingerprint[0] is not self._pieces:
+            instances, durations, pitches, attachments = self._get_columns()
+            kinds, values, integral, chord_offsets, other_pitches = _encode_pitches(
+                pitches
+            )
+            hash_ = hashlib.blake2b(digest_size=20)
+            hash_.update(len(instances).to_bytes(8, "little"))
+            for column in (instances, durations):
+                hash_.update(np.asarray(column, dtype="<f8").tobytes())
+            for column in (kinds, values, integral, chord_offsets):
+                hash_.update(column.tobytes())
+            hash_.update(repr(sorted(other_pitches.items())).encode())
+            hash_.update(repr(sorted(attachments.items())).encode())
+            hash_.update(repr(self._sequence_duration).encode())
+            self._fingerprint = (self._pieces, hash_.hexdigest())
+        return self._fingerprint[1]
+
     def insert(self, offset: float, sequence: "Sequence") -> None:
         """
         Inserts a sequence into another. ``offset`` should be specified in
@@ -113,7 +370,7 @@ class Sequence:
             ... )
             >>> sequence_0.insert(2, sequence_1)
             >>> print(sequence_0.instances)
-            [0, 1, 2, 3, 4, 5, 6, 7]
+            [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]
 
             >>> print(sequence_0.pitches)
             [0, 0, 1, 1, 1, 1, 0, 0]
@@ -123,21 +380,72 @@ class Sequence:
 
         """
         assert isinstance(sequence, type(self))
-        index = bisect.bisect_left(self.instances, offset)
-        self._sound_points[index:] = [
-            SoundPoint.from_sound_point(
-                sound_point, instance=sound_point.instance + sequence._sequence_duration
-            )
-            for sound_point in self._sound_points[index:]
-        ]
-        self._sound_points[index:index] = [
-            SoundPoint.from_sound_point(
-                sound_point, instance=sound_point.instance + offset
-            )
-            for sound_point in sequence
+        pieces_before, pieces_after = self._split_pieces(offset)
+        self._pieces = [
+            *pieces_before,
+            *(piece.shift(offset) for piece in sequence._pieces),
+            *(piece.shift(sequence._sequence_duration) for piece in pieces_after),
         ]
         self._sequence_duration += sequence._sequence_duration
 
+    def save(self, path: pathlib.Path | str) -> None:
+        """
+        Saves the sequence to ``path`` in one binary file, which ``load`` can
+        memory-map. Instances, durations and the numbers of the pitches are
+        kept as columns, with the offsets of chords into the numbers.
+        Attachments and any other pitches are pickled into a side table. The
+        file is written atomically.
+
+        ..  container:: example
+
+            >>> import pathlib
+            >>> import tempfile
+            >>> sequence = pang.Sequence.from_arrays(
+            ...     [0, 1, 1.5], [1, 0.5, 0.5], 2, pitches=[0, (2, 3.5), None]
+            ... )
+            >>> with tempfile.TemporaryDirectory() as directory:
+            ...     path = pathlib.Path(directory) / "sequence.pangseq"
+            ...     sequence.save(path)
+            ...     pang.Sequence.load(path, mmap=False) == sequence
+            ...
+            True
+
+        """
+        instances, durations, pitches, attachments = self._get_columns()
+        kinds, values, integral, chord_offsets, other_pitches = _encode_pitches(pitches)
+        columns = {
+            "instances": np.ascontiguousarray(instances, dtype="<f8"),
+            "durations": np.ascontiguousarray(durations, dtype="<f8"),
+            "pitch_kinds": kinds,
+            "pitch_values": values,
+            "pitch_values_integral": integral,
+            "chord_offsets": chord_offsets,
+            "side_table": np.frombuffer(
+                pickle.dumps(
+                    {
+                        "attachments": attachments,
+                        "other_pitches": other_pitches,
+                        "sequence_duration": self._sequence_duration,
+                    }
+                ),
+                dtype=np.uint8,
+            ),
+        }
+        header = json.dumps(
+            {
+                "version": _FILE_FORMAT_VERSION,
+                "columns": _describe_columns(columns),
+            }
+        ).encode()
+        path = pathlib.Path(path)
+        with _open_atomically(path, "wb") as fp:
+            fp.write(_FILE_MAGIC)
+            fp.write(len(header).to_bytes(8, "little"))
+            fp.write(header)
+            for column in columns.values():
+                fp.write(bytes(_align(fp.tell()) - fp.tell()))
+                fp.write(column.tobytes())
+
     def superpose(self, offset: float, sequence: "Sequence"):
         """
         Superpose a sequence on top of another. ``offset`` should be specified
@@ -167,7 +475,7 @@ class Sequence:
             ... )
             >>> sequence_0.superpose(2, sequence_1)
             >>> print(sequence_0.instances)
-            [0, 1, 2, 2, 3, 3, 4, 5]
+            [0.0, 1.0, 2.0, 2.0, 3.0, 3.0, 4.0, 5.0]
 
             >>> print(sequence_0.pitches)
             [0, 0, 1, 0, 1, 0, 1, 1]
@@ -177,24 +485,153 @@ class Sequence:
 
         """
         assert isinstance(sequence, type(self))
-        for sound_point in sequence:
-            new_instance = sound_point.instance + offset
-            index = bisect.bisect_left(self.instances, new_instance)
-            self._sound_points.insert(
-                index, SoundPoint.from_sound_point(sound_point, instance=new_instance)
-            )
+        self._superpose_all([(offset, sequence)])
+
+    def transpose(self, interval) -> None:
+        """
+        Transposes the pitches of all sound points by ``interval``, or of each
+        sound point by its own interval if ``interval`` is an array, on the
+        ragged pitches. Instances, durations and attachments are kept as they
+        are, without being copied.
+
+        ..  container:: example
+
+            >>> sequence = pang.Sequence.from_arrays(
+            ...     [0, 1, 2], [1, 1, 1], 3, pitches=[0, (2, 7), None]
+            ... )
+            >>> sequence.transpose([12, -1.5, 0])
+            >>> sequence.pitches
+            [12, (0.5, 5.5), None]
+
+        """
+        instances, durations, _, attachments = self._get_columns()
+        ragged_pitches = self.ragged_pitches.transpose(interval)
+        pitches = ragged_pitches.to_pitches()
+        self._set_columns(instances, durations, pitches, attachments)
+        self._ragged_pitches = (pitches, ragged_pitches)
+
+    def update_attachments(self, attachments: dict[int, typing.Any]) -> None:
+        """
+        Replaces the attachments of the sound points at the positions in
+        ``attachments``. Empty attachments remove those there were. Instances,
+        durations and pitches are kept as they are, without being copied.
+
+        ..  container:: example
+
+            >>> sequence = pang.Sequence.from_arrays(
+            ...     [0, 1, 2], [1, 1, 1], 3, attachments={0: ["a"]}
+            ... )
+            >>> sequence.update_attachments({0: [], 2: ["b"]})
+            >>> sequence.sparse_attachments
+            mappingproxy({2: ['b']})
+
+        """
+        instances, durations, pitches, current_attachments = self._get_columns()
+        updated_attachments = dict(current_attachments)
+        for position, value in attachments.items():
+            position = range(len(instances))[position]
+            if value:
+                updated_attachments[position] = value
+            else:
+                updated_attachments.pop(position, None)
+        self._set_columns(instances, durations, pitches, updated_attachments)
+
+    def window(self, start: float, end: float) -> "Sequence":
+        """
+        Gets the sound points starting at or after ``start`` and before
+        ``end``, in seconds, as a sequence lasting from ``start`` to ``end``.
+        The sound points are found by bisecting the instances, and the window
+        refers to the columns of this sequence rather than copying them. Its
+        instances are moved to start from zero only when they are needed.
+
+        ..  container:: example
+
+            >>> sequence = pang.Sequence.from_arrays(
+            ...     [0, 1, 2, 3], [1, 1, 1, 1], 4, pitches=[0, 1, 2, 3]
+            ... )
+            >>> window = sequence.window(1, 3)
+            >>> print(window.instances)
+            [0.0, 1.0]
+
+            >>> print(window.pitches)
+            [1, 2]
+
+            >>> window.sequence_duration
+            2
+
+        """
+        if end < start:
+            raise ValueError("The window ends before it starts")
+        columns = self._get_columns()
+        start_index, stop_index = np.searchsorted(columns[0], [start, end])
+        window = type(self).__new__(type(self))
+        window._pieces = [_Piece(columns, int(start_index), int(stop_index), (-start,))]
+        window._sequence_duration = end - start
+        return window
+
+    def _copy(self) -> "Sequence":
+        sequence = type(self).__new__(type(self))
+        sequence._pieces = list(self._pieces)
+        sequence._sequence_duration = self._sequence_duration
+        return sequence
+
+    def _superpose_all(
+        self, offsets_and_sequences: list[tuple[float, "Sequence"]]
+    ) -> None:
+        """
+        Superposes sequences one after another in one stable sort.
+        """
+        # Incoming sound points go before existing ones at the same instance,
+        # and in reverse order among themselves, as when each of them was
+        # inserted before any sound point at its instance.
+        merged_columns, _ = _merge_columns(
+            [
+                (
+                    sequence._instances[::-1] + offset,
+                    sequence._durations[::-1],
+                    sequence._pitches[::-1],
+                    {
+                        len(sequence) - 1 - position: attachments
+                        for position, attachments in sequence._attachments.items()
+                    },
+                )
+                for offset, sequence in reversed(offsets_and_sequences)
+            ]
+            + [self._get_columns()]
+        )
+        self._set_columns(*merged_columns)
+
+    @property
+    def attachments(self):
+        return [
+            self._attachments.get(index, _NO_ATTACHMENTS) for index in range(len(self))
+        ]
+
+    @property
+    def durations_array(self) -> np.ndarray:
+        """
+        Returns a read-only view of the durations.
+        """
+        return _read_only(self._durations)
 
     @property
     def instances(self):
-        return [event.instance for event in self._sound_points]
+        return self._instances.tolist()
+
+    @property
+    def instances_array(self) -> np.ndarray:
+        """
+        Returns a read-only view of the instances.
+        """
+        return _read_only(self._instances)
 
     @property
     def pitches(self):
-        return [event.pitch for event in self._sound_points]
+        return list(self._pitches)
 
     @property
     def durations(self):
-        return [event.duration for event in self._sound_points]
+        return self._durations.tolist()
 
     @property
     def durations_in_millisecond(self):
@@ -202,7 +639,22 @@ class Sequence:
         Returns the duration of each note in millisecond (before queue
         simulation).
         """
-        return [event.duration * 1000 for event in self._sound_points]
+        return (self._durations * 1000).tolist()
+
+    @property
+    def ragged_pitches(self) -> RaggedPitches:
+        """
+        Returns the pitches as ragged pitches, which are kept until the
+        sequence is changed.
+        """
+        pitches = self._pitches
+        if self._ragged_pitches[0] is not pitches:
+            if isinstance(pitches, _SavedPitches):
+                ragged_pitches = pitches.get_ragged_pitches()
+            else:
+                ragged_pitches = RaggedPitches.from_pitches(pitches)
+            self._ragged_pitches = (pitches, ragged_pitches)
+        return typing.cast(RaggedPitches, self._ragged_pitches[1])
 
     @property
     def sequence_duration(self):
@@ -211,21 +663,127 @@ class Sequence:
         """
         return self._sequence_duration
 
+    @property
+    def sparse_attachments(self) -> types.MappingProxyType:
+        """
+        Returns a read-only mapping of the positions of the sound points that
+        have attachments to their attachments.
+        """
+        return types.MappingProxyType(self._attachments)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        instances,
+        durations,
+        sequence_duration: float,
+        pitches: list | None = None,
+        attachments: dict[int, typing.Any] | None = None,
+    ) -> "Sequence":
+        """
+        Makes a sequence from its columns, without making any ``SoundPoint``.
+        Pitches default to ``0``, and ``attachments`` maps the positions of
+        sound points to their attachments.
+        """
+        instances = np.array(instances, dtype=float)
+        durations = np.array(durations, dtype=float)
+        if pitches is None:
+            pitches = [0] * len(instances)
+        if not len(instances) == len(durations) == len(pitches):
+            raise ValueError("Columns are of different lengths")
+        sequence = cls.__new__(cls)
+        sequence._set_columns(
+            instances,
+            durations,
+            list(pitches),
+            {
+                position: attachments
+                for position, attachments in (attachments or {}).items()
+                if attachments
+            },
+        )
+        sequence._sequence_duration = sequence_duration
+        sequence._validate()
+        return sequence
+
+    @classmethod
+    def merge(
+        cls, offsets: Iterable[float], sequences: Iterable["Sequence"]
+    ) -> "Sequence":
+        """
+        Merges sequences, each starting at its offset in seconds, in one stable
+        sort. Sound points at the same instance keep the order of their
+        sequences. The merged sequence lasts until the last of them ends.
+
+        ..  container:: example
+
+            >>> sequence_0 = pang.Sequence.from_arrays(
+            ...     [0, 1], [0.5, 0.5], 2, pitches=[0, 0]
+            ... )
+            >>> sequence_1 = pang.Sequence.from_arrays(
+            ...     [0, 0.5], [0.5, 0.5], 1, pitches=[1, 1]
+            ... )
+            >>> sequence = pang.Sequence.merge(
+            ...     [0, 0, 1.5], [sequence_0, sequence_1, sequence_1]
+            ... )
+            >>> print(sequence.instances)
+            [0.0, 0.0, 0.5, 1.0, 1.5, 2.0]
+
+            >>> print(sequence.pitches)
+            [0, 1, 1, 0, 1, 1]
+
+            >>> print(sequence.sequence_duration)
+            2.5
+
+        """
+        merged, _ = cls._merge(offsets, sequences)
+        return merged
+
+    @classmethod
+    def _merge(
+        cls, offsets: Iterable[float], sequences: Iterable["Sequence"]
+    ) -> tuple["Sequence", np.ndarray]:
+        """
+        Merges sequences like ``merge``, and also returns the position of each
+        merged sound point among the sound points of all sequences, one
+        sequence after another.
+        """
+        offsets_and_sequences = list(zip(offsets, sequences, strict=True))
+        merged_columns, order = _merge_columns(
+            [
+                (
+                    sequence._instances + offset,
+                    sequence._durations,
+                    sequence._pitches,
+                    sequence._attachments,
+                )
+                for offset, sequence in offsets_and_sequences
+            ]
+        )
+        merged = cls.__new__(cls)
+        merged._set_columns(*merged_columns)
+        merged._sequence_duration = max(
+            (
+                offset + sequence._sequence_duration
+                for offset, sequence in offsets_and_sequences
+            ),
+            default=0,
+        )
+        return merged, order
+
     @classmethod
     def from_sequences(cls, sequences: Iterable["Sequence"]) -> "Sequence":
         current_duration = 0.0
-        sound_points: list[SoundPoint] = []
+        pieces: list[_Piece] = []
         for sequence in sequences:
-            sound_points.extend(
-                [
-                    SoundPoint.from_sound_point(
-                        sound_point, instance=sound_point.instance + current_duration
-                    )
-                    for sound_point in sequence
-                ]
-            )
+            pieces.extend(piece.shift(current_duration) for piece in sequence._pieces)
             current_duration += sequence._sequence_duration
-        return cls(sound_points, current_duration)
+        sequence = cls.__new__(cls)
+        sequence._set_columns(np.empty(0), np.empty(0), [], {})
+        sequence._pieces = pieces or sequence._pieces
+        sequence._sequence_duration = current_duration
+        sequence._validate()
+        return sequence
 
     @classmethod
     def from_sound_points_generator(
@@ -237,3 +795,454 @@ class Sequence:
     @classmethod
     def empty_sequence(cls) -> "Sequence":
         return cls([], 0)
+
+    @classmethod
+    def load(cls, path: pathlib.Path | str, mmap: bool = True) -> "Sequence":
+        """
+        Loads a sequence saved by ``save``. With ``mmap``, the columns are
+        memory-mapped read-only instead of read into memory. Pitches are only
+        decoded when one of them is read, and ``ragged_pitches`` of numbers and
+        chords are made from the columns without decoding them. The side table
+        is unpickled, so only load files you trust.
+        """
+        path = pathlib.Path(path)
+        with path.open("rb") as fp:
+            if fp.read(len(_FILE_MAGIC)) != _FILE_MAGIC:
+                raise ValueError(f"{path} is not a saved sequence")
+            header_length = int.from_bytes(fp.read(8), "little")
+            header = json.loads(fp.read(header_length))
+        data_offset = _align(len(_FILE_MAGIC) + 8 + header_length)
+        if header["version"] != _FILE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported sequence file version {header['version']}")
+        columns = {
+            name: _read_column(path, data_offset, description, mmap)
+            for name, description in header["columns"].items()
+        }
+        side_table = pickle.loads(columns["side_table"].tobytes())
+        sequence = cls.__new__(cls)
+        sequence._set_columns(
+            columns["instances"],
+            columns["durations"],
+            _SavedPitches(
+                columns["pitch_kinds"],
+                columns["pitch_values"],
+                columns["pitch_values_integral"],
+                columns["chord_offsets"],
+                side_table["other_pitches"],
+            ),
+            side_table["attachments"],
+        )
+        sequence._sequence_duration = side_table["sequence_duration"]
+        return sequence
+
+
+class LazySequence:
+    """
+    Sequence of sound-points that records ``extend``, ``insert`` and
+    ``superpose`` and carries all of them out when materialized.
+
+    Concatenations are gathered as pieces of one sequence, put together in one
+    allocation, and each run of superpositions is merged in one stable sort.
+    ``materialize`` returns the same sequence as the eager calls would have
+    made. Operands may themselves be lazy sequences. They are read when the
+    lazy sequence is materialized, not when the operations are recorded.
+
+    ..  container:: example
+
+        >>> sequence_0 = pang.Sequence.from_arrays(
+        ...     [0, 1], [0.5, 0.5], 2, pitches=[0, 0]
+        ... )
+        >>> sequence_1 = pang.Sequence.from_arrays(
+        ...     [0, 0.5], [0.5, 0.5], 1, pitches=[1, 1]
+        ... )
+        >>> lazy_sequence = pang.LazySequence(sequence_0)
+        >>> lazy_sequence.superpose(0.5, sequence_1)
+        >>> lazy_sequence.extend(sequence_1)
+        >>> lazy_sequence.superpose(2, sequence_1)
+        >>> lazy_sequence.sequence_duration
+        3
+
+        >>> sequence = lazy_sequence.materialize()
+        >>> print(sequence.instances)
+        [0.0, 0.5, 1.0, 1.0, 2.0, 2.0, 2.5, 2.5]
+
+        >>> print(sequence.pitches)
+        [0, 1, 1, 0, 1, 1, 1, 1]
+
+    """
+
+    def __init__(self, sequence: "Sequence | LazySequence"):
+        self._sequence = sequence
+        self._operations: list[_Operation] = []
+        self._sequence_duration = sequence.sequence_duration
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}({self._sequence!r}, "
+            f"{len(self._operations)} operations)"
+        )
+
+    def extend(self, sequence: "Sequence | LazySequence", time_gap=0) -> None:
+        self._operations.append(_Operation("extend", time_gap, sequence))
+        self._sequence_duration += sequence.sequence_duration + time_gap
+
+    def insert(self, offset: float, sequence: "Sequence | LazySequence") -> None:
+        self._operations.append(_Operation("insert", offset, sequence))
+        self._sequence_duration += sequence.sequence_duration
+
+    def superpose(self, offset: float, sequence: "Sequence | LazySequence") -> None:
+        self._operations.append(_Operation("superpose", offset, sequence))
+
+    def materialize(self) -> Sequence:
+        """
+        Returns the sequence made by the recorded operations.
+        """
+        sequence = _materialize(self._sequence)._copy()
+        superposed: list[tuple[float, Sequence]] = []
+        superposed_order = _InstanceOrder.from_instances(np.empty(0))
+        order = None
+        for operation in self._operations:
+            operand = _materialize(operation.sequence)
+            operand_order = _InstanceOrder.from_instances(operand.instances_array)
+            if operation.name == "superpose":
+                superposed.append((operation.offset, operand))
+                superposed_order = superposed_order.superpose(
+                    operand_order, operation.offset
+                )
+                continue
+            if operation.name == "extend":
+                if order is None:
+                    order = _InstanceOrder.from_instances(sequence.instances_array)
+                offset = sequence.sequence_duration + operation.offset
+                extended_order = order.extend(operand_order, offset)
+            if superposed and not (
+                operation.name == "extend"
+                and extended_order.is_sorted
+                and superposed_order.last_instance <= offset
+            ):
+                sequence._superpose_all(superposed)
+                superposed = []
+                superposed_order = _InstanceOrder.from_instances(np.empty(0))
+                order = None
+            if operation.name == "extend":
+                sequence.extend(operand, operation.offset)
+                order = order and extended_order
+            else:
+                sequence.insert(operation.offset, operand)
+                order = None
+        if superposed:
+            sequence._superpose_all(superposed)
+        return sequence
+
+    @property
+    def sequence_duration(self):
+        return self._sequence_duration
+
+    @classmethod
+    def from_sequences(
+        cls, sequences: Iterable["Sequence | LazySequence"]
+    ) -> "LazySequence":
+        lazy_sequence = cls(Sequence.empty_sequence())
+        for sequence in sequences:
+            lazy_sequence.extend(sequence)
+        return lazy_sequence
+
+
+class _InstanceOrder(typing.NamedTuple):
+    """
+    Whether instances are in order, and the first and last of them, which
+    ``LazySequence.materialize`` keeps up to date as it extends, so that it
+    only reads the instances of the operands.
+    """
+
+    is_sorted: bool
+    first_instance: float
+    last_instance: float
+
+    def extend(self, order: "_InstanceOrder", offset: float) -> "_InstanceOrder":
+        """
+        Returns the order of these instances followed by those of ``order``,
+        with ``offset`` added to them.
+        """
+        if order.first_instance == np.inf:
+            return self
+        first_instance = order.first_instance + offset
+        return _InstanceOrder(
+            self.is_sorted and order.is_sorted and self.last_instance <= first_instance,
+            min(self.first_instance, first_instance),
+            max(self.last_instance, order.last_instance + offset),
+        )
+
+    def superpose(self, order: "_InstanceOrder", offset: float) -> "_InstanceOrder":
+        """
+        Returns the order of these instances merged with those of ``order``,
+        with ``offset`` added to them.
+        """
+        return _InstanceOrder(
+            True,
+            min(self.first_instance, order.first_instance + offset),
+            max(self.last_instance, order.last_instance + offset),
+        )
+
+    @classmethod
+    def from_instances(cls, instances: np.ndarray) -> "_InstanceOrder":
+        return cls(
+            bool(np.all(instances[1:] >= instances[:-1])),
+            float(instances.min(initial=np.inf)),
+            float(instances.max(initial=-np.inf)),
+        )
+
+
+class _Operation(typing.NamedTuple):
+    name: str
+    offset: float
+    sequence: Sequence | LazySequence
+
+
+_END_BLOCK_SIZE = 64
+_END_BLOCK_OFFSETS = np.arange(_END_BLOCK_SIZE)
+_FILE_ALIGNMENT = 64
+_FILE_FORMAT_VERSION = 1
+_FILE_MAGIC = b"PANGSEQ\x00"
+_SCALAR_PITCH = 0
+_CHORD_PITCH = 1
+_NO_PITCH = 2
+_OTHER_PITCH = 3
+
+
+class _Piece(typing.NamedTuple):
+    """
+    Sound points ``start`` to ``stop`` of ``columns``, with ``offsets`` added
+    to their instances one after another, as each edit added them.
+    """
+
+    columns: tuple[np.ndarray, np.ndarray, typing.Sequence, dict]
+    start: int
+    stop: int
+    offsets: tuple[float, ...] = ()
+
+    def get_columns(self) -> tuple[np.ndarray, np.ndarray, typing.Sequence, dict]:
+        instances, durations, pitches, attachments = self.columns
+        instances = instances[self.start : self.stop]
+        for offset in self.offsets:
+            instances = instances + offset
+        return (
+            instances,
+            durations[self.start : self.stop],
+            pitches[self.start : self.stop],
+            {
+                position - self.start: value
+                for position, value in attachments.items()
+                if self.start <= position < self.stop
+            },
+        )
+
+    def get_instance(self, index: int) -> float:
+        instance = self.columns[0][index]
+        for offset in self.offsets:
+            instance = instance + offset
+        return instance
+
+    def is_whole(self) -> bool:
+        return (
+            not self.offsets and self.start == 0 and self.stop == len(self.columns[0])
+        )
+
+    def shift(self, offset: float) -> "_Piece":
+        return self._replace(offsets=(*self.offsets, offset))
+
+
+class _SavedPitches(typing.Sequence):
+    """
+    Pitches of a loaded sequence, kept in the columns ``save`` wrote them to
+    and decoded once, when one of them is first read.
+    """
+
+    def __init__(
+        self,
+        kinds: np.ndarray,
+        values: np.ndarray,
+        integral: np.ndarray,
+        chord_offsets: np.ndarray,
+        other_pitches: dict[int, typing.Any],
+    ):
+        self.columns = (kinds, values, integral, chord_offsets, other_pitches)
+        self._pitches: list | None = None
+
+    def __eq__(self, pitches):
+        return list(self) == list(pitches)
+
+    def __getitem__(self, index):
+        return self.decode()[index]
+
+    def __iter__(self):
+        return iter(self.decode())
+
+    def __len__(self):
+        return len(self.columns[0])
+
+    def decode(self) -> list:
+        if self._pitches is None:
+            self._pitches = _decode_pitches(*self.columns)
+        return self._pitches
+
+    def get_ragged_pitches(self) -> RaggedPitches:
+        kinds, values, _, chord_offsets, other_pitches = self.columns
+        if other_pitches:
+            raise ValueError(
+                f"Pitch {next(iter(other_pitches.values()))!r} is not a number or a chord"
+            )
+        return RaggedPitches(values, chord_offsets, kinds == _CHORD_PITCH)
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _FILE_ALIGNMENT) * _FILE_ALIGNMENT
+
+
+def _decode_pitches(
+    kinds: np.ndarray,
+    values: np.ndarray,
+    integral: np.ndarray,
+    chord_offsets: np.ndarray,
+    other_pitches: dict[int, typing.Any],
+) -> list:
+    pitch_numbers = [
+        int(value) if is_integral else value
+        for value, is_integral in zip(values.tolist(), integral.tolist())
+    ]
+    if not np.any(kinds):
+        return pitch_numbers
+    pitches: list = []
+    for index, (kind, start, stop) in enumerate(
+        zip(kinds.tolist(), chord_offsets[:-1].tolist(), chord_offsets[1:].tolist())
+    ):
+        if kind == _SCALAR_PITCH:
+            pitches.append(pitch_numbers[start])
+        elif kind == _CHORD_PITCH:
+            pitches.append(tuple(pitch_numbers[start:stop]))
+        elif kind == _NO_PITCH:
+            pitches.append(None)
+        else:
+            pitches.append(other_pitches[index])
+    return pitches
+
+
+def _describe_columns(columns: dict[str, np.ndarray]) -> dict:
+    """
+    Describes where each column is, from the start of the first one.
+    """
+    descriptions = {}
+    offset = 0
+    for name, column in columns.items():
+        offset = _align(offset)
+        descriptions[name] = {
+            "dtype": column.dtype.str,
+            "length": len(column),
+            "offset": offset,
+        }
+        offset += column.nbytes
+    return descriptions
+
+
+def _encode_pitches(
+    pitches: typing.Sequence,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict[int, typing.Any]]:
+    if isinstance(pitches, _SavedPitches):
+        return pitches.columns
+    kinds = np.zeros(len(pitches), dtype=np.uint8)
+    chord_sizes = np.ones(len(pitches), dtype=np.int64)
+    values: list[float] = []
+    integral: list[bool] = []
+    other_pitches = {}
+    for index, pitch in enumerate(pitches):
+        if _is_number(pitch):
+            values.append(pitch)
+            integral.append(isinstance(pitch, numbers.Integral))
+        elif isinstance(pitch, tuple) and all(_is_number(_) for _ in pitch):
+            kinds[index] = _CHORD_PITCH
+            chord_sizes[index] = len(pitch)
+            values.extend(pitch)
+            integral.extend(isinstance(_, numbers.Integral) for _ in pitch)
+        else:
+            kinds[index] = _NO_PITCH if pitch is None else _OTHER_PITCH
+            chord_sizes[index] = 0
+            if pitch is not None:
+                other_pitches[index] = pitch
+    chord_offsets = np.zeros(len(pitches) + 1, dtype="<i8")
+    np.cumsum(chord_sizes, out=chord_offsets[1:])
+    return (
+        kinds,
+        np.array(values, dtype="<f8"),
+        np.array(integral, dtype=np.uint8),
+        chord_offsets,
+        other_pitches,
+    )
+
+
+def _materialize(sequence: Sequence | LazySequence) -> Sequence:
+    if isinstance(sequence, LazySequence):
+        return sequence.materialize()
+    return sequence
+
+
+def _merge_columns(
+    columns: list[tuple[np.ndarray, np.ndarray, typing.Sequence, dict]],
+) -> tuple[tuple[np.ndarray, np.ndarray, typing.Sequence, dict], np.ndarray]:
+    """
+    Merges columns of sound points by instance, and returns the merged columns
+    with the order that sorts the concatenated columns. Each of them is in
+    order, so the stable sort only merges runs, and keeps ties in the given
+    order.
+    """
+    if not columns:
+        return (np.empty(0), np.empty(0), [], {}), np.empty(0, dtype=int)
+    instances = np.concatenate([instances for instances, _, _, _ in columns])
+    order = np.argsort(instances, kind="stable")
+    positions = np.empty_like(order)
+    positions[order] = np.arange(len(order))
+    pitches = [pitch for _, _, pitches, _ in columns for pitch in pitches]
+    attachments = {}
+    length = 0
+    for column_instances, _, _, column_attachments in columns:
+        attachments.update(
+            {
+                int(positions[length + position]): value
+                for position, value in column_attachments.items()
+            }
+        )
+        length += len(column_instances)
+    return (
+        instances[order],
+        np.concatenate([durations for _, durations, _, _ in columns])[order],
+        [pitches[index] for index in order.tolist()],
+        attachments,
+    ), order
+
+
+def _read_column(
+    path: pathlib.Path, data_offset: int, description: dict, mmap: bool
+) -> np.ndarray:
+    dtype = np.dtype(description["dtype"])
+    if not description["length"]:
+        return np.empty(0, dtype=dtype)
+    if mmap:
+        return np.memmap(
+            path,
+            dtype=dtype,
+            mode="r",
+            offset=data_offset + description["offset"],
+            shape=(description["length"],),
+        )
+    with path.open("rb") as fp:
+        fp.seek(data_offset + description["offset"])
+        return np.fromfile(fp, dtype=dtype, count=description["length"])
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+def _shift_keys(dictionary: dict[int, typing.Any], shift: int) -> dict:
+    return {key + shift: value for key, value in dictionary.items()}
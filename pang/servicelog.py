@@ -0,0 +1,137 @@
+import dataclasses
+
+import numpy as np
+
+
+@dataclasses.dataclass(eq=False, frozen=True)
+class ServiceLog:
+    """
+    Service log of a queue simulation, with one entry per sound point, in the
+    order of the simulated sequence.
+
+    ..  container:: example
+
+        >>> instances = [0, 0.5, 1, 3]
+        >>> durations = [1, 1, 1, 1]
+        >>> sound_points_generator = pang.ManualSoundPointsGenerator(
+        ...     instances=instances,
+        ...     durations=durations,
+        ... )
+        >>> sequence = pang.Sequence.from_sound_points_generator(
+        ...     sound_points_generator, 4
+        ... )
+        >>> servers, service_log = pang.simulate_queue_with_service_log(
+        ...     sequence, (pang.NoteServer(),)
+        ... )
+        >>> print(service_log.waits)
+        [0.  0.5 1.  0. ]
+
+        >>> print(service_log.mean_wait)
+        0.375
+
+        >>> print(service_log.utilizations)
+        [1.]
+
+    """
+
+    arrivals: np.ndarray
+    starts: np.ndarray
+    ends: np.ndarray
+    server_indices: np.ndarray
+    number_of_servers: int
+    sources: np.ndarray | None = None
+
+    def __eq__(self, service_log):
+        if not isinstance(service_log, type(self)):
+            return NotImplemented
+        return all(
+            np.array_equal(getattr(self, field.name), getattr(service_log, field.name))
+            for field in dataclasses.fields(self)
+        )
+
+    def __len__(self):
+        return len(self.arrivals)
+
+    def for_source(self, source: int) -> "ServiceLog":
+        """
+        Returns the service log of the sound points that came from the
+        ``source``-th of the simulated sequences.
+        """
+        if self.sources is None:
+            raise ValueError(f"{self} does not record sources")
+        is_from_source = self.sources == source
+        return ServiceLog(
+            self.arrivals[is_from_source],
+            self.starts[is_from_source],
+            self.ends[is_from_source],
+            self.server_indices[is_from_source],
+            self.number_of_servers,
+            self.sources[is_from_source],
+        )
+
+    def queue_lengths(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the instances at which the number of waiting sound points
+        changes, and that number from each instance on.
+        """
+        instances = np.concatenate((self.arrivals, self.starts))
+        changes = np.concatenate(
+            (np.ones(len(self), dtype=int), -np.ones(len(self), dtype=int))
+        )
+        order = np.lexsort((changes, instances))
+        instances, lengths = instances[order], np.cumsum(changes[order])
+        is_last_change = np.append(instances[1:] != instances[:-1], True)
+        return instances[is_last_change], lengths[is_last_change]
+
+    @property
+    def busy_durations(self) -> np.ndarray:
+        """
+        Returns the total duration each server spends serving.
+        """
+        return np.bincount(
+            self.server_indices,
+            weights=self.ends - self.starts,
+            minlength=self.number_of_servers,
+        )
+
+    @property
+    def max_wait(self) -> float:
+        return float(self.waits.max(initial=0.0))
+
+    @property
+    def mean_queue_length(self) -> float:
+        """
+        Returns the time-averaged number of waiting sound points, from the
+        first arrival to the last end.
+        """
+        if not len(self):
+            return 0.0
+        return float(self.waits.sum() / self.span)
+
+    @property
+    def mean_wait(self) -> float:
+        if not len(self):
+            return 0.0
+        return float(self.waits.mean())
+
+    @property
+    def span(self) -> float:
+        """
+        Returns the duration from the first arrival to the last end.
+        """
+        if not len(self):
+            return 0.0
+        return float(self.ends.max() - self.arrivals.min())
+
+    @property
+    def utilizations(self) -> np.ndarray:
+        """
+        Returns the fraction of the span each server spends serving.
+        """
+        if not self.span:
+            return np.zeros(self.number_of_servers)
+        return self.busy_durations / self.span
+
+    @property
+    def waits(self) -> np.ndarray:
+        return self.starts - self.arrivals
@@ -0,0 +1,199 @@
+import builtins
+import dis
+import hashlib
+import pathlib
+import types
+
+import numpy as np
+
+from .noteserver import NoteServer
+from .paths import _open_atomically
+from .sequences import Sequence
+
+_CACHE_FORMAT_VERSION = 2
+_SERVER_STORAGE_ATTRIBUTES = (
+    "_durations",
+    "_length",
+    "_pitch_kinds",
+    "_pitch_values",
+    "_q_event_sequence",
+    "_sparse_attachments",
+    "_sparse_pitches",
+)
+_CONSTANT_TYPES = (type(None), bool, int, float, complex, str, bytes)
+_GLOBAL_OPERATIONS = ("LOAD_GLOBAL", "LOAD_NAME")
+
+
+class _UnkeyableError(Exception):
+    pass
+
+
+def get_simulation_key(
+    sequence: Sequence,
+    servers: tuple[NoteServer, ...],
+    *configuration,
+) -> str | None:
+    """
+    Returns a key that changes whenever the content of ``sequence``, the type
+    or configuration of any server, or any of ``configuration`` changes.
+    Servers are keyed by their type, the code and class attributes of every
+    class their type derives from, and their attributes other than what they
+    have served, so that editing a method that ``can_serve`` calls through
+    ``self`` changes the key too.
+
+    Code is keyed by its bytecode, its constants, the names it looks up, and
+    the values of the globals and closure variables it reads. Functions it
+    reads are keyed by their own code in turn, and tuples, lists, sets and
+    dictionaries by their content when the key is made. Returns ``None``, so
+    that the simulation is not cached, when any of these values is something
+    other than these, a constant, a module, a class or a function, since such
+    a value may change without the key changing.
+    """
+    hash_ = hashlib.blake2b(digest_size=20)
+    hash_.update(repr(_CACHE_FORMAT_VERSION).encode())
+    hash_.update(sequence.fingerprint().encode())
+    try:
+        for server in servers:
+            server_type = type(server)
+            hash_.update(
+                f"{server_type.__module__}.{server_type.__qualname__}".encode()
+            )
+            hash_.update(_fingerprint_class(server_type).encode())
+            hash_.update(
+                repr(
+                    sorted(
+                        (name, value)
+                        for name, value in vars(server).items()
+                        if name not in _SERVER_STORAGE_ATTRIBUTES
+                    )
+                ).encode()
+            )
+        for item in configuration:
+            if callable(item):
+                hash_.update(_fingerprint_function(item).encode())
+            else:
+                hash_.update(repr(item).encode())
+    except _UnkeyableError:
+        return None
+    return hash_.hexdigest()
+
+
+def read_simulation(
+    cache_directory: pathlib.Path, key: str
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Returns the cached starts and server indices under ``key``, if any.
+    """
+    path = pathlib.Path(cache_directory) / f"{key}.npz"
+    if not path.exists():
+        return None
+    with np.load(path) as arrays:
+        return arrays["starts"], arrays["server_indices"]
+
+
+def write_simulation(
+    cache_directory: pathlib.Path,
+    key: str,
+    starts: np.ndarray,
+    server_indices: np.ndarray,
+) -> None:
+    """
+    Caches starts and server indices under ``key``. The file is written
+    atomically, so that concurrent builds never read a partial file.
+    """
+    cache_directory = pathlib.Path(cache_directory)
+    cache_directory.mkdir(parents=True, exist_ok=True)
+    with _open_atomically(cache_directory / f"{key}.npz", "wb") as fp:
+        np.savez(fp, starts=starts, server_indices=server_indices)
+
+
+def _fingerprint_class(class_: type) -> str:
+    seen: set = set()
+    fingerprint = []
+    for base in class_.__mro__:
+        if base is object:
+            continue
+        for name, value in sorted(vars(base).items()):
+            if name.startswith("__") or name == "_abc_impl":
+                continue
+            if isinstance(value, property):
+                value = (value.fget, value.fset, value.fdel)
+            elif isinstance(value, (classmethod, staticmethod)):
+                value = value.__func__
+            fingerprint.append(
+                (base.__qualname__, name, _fingerprint_value(value, seen))
+            )
+    return repr(fingerprint)
+
+
+def _fingerprint_code(code: types.CodeType, namespace: dict, seen: set) -> list:
+    fingerprint: list = [code.co_code, code.co_names]
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            fingerprint.append(_fingerprint_code(constant, namespace, seen))
+        else:
+            fingerprint.append(repr(constant))
+    for instruction in dis.get_instructions(code):
+        if instruction.opname not in _GLOBAL_OPERATIONS:
+            continue
+        name = instruction.argval
+        if name in namespace:
+            value = namespace[name]
+        elif hasattr(builtins, name):
+            value = getattr(builtins, name)
+        else:
+            raise _UnkeyableError(name)
+        fingerprint.append((name, _fingerprint_value(value, seen)))
+    return fingerprint
+
+
+def _fingerprint_function(function, seen: set | None = None) -> str:
+    if seen is None:
+        seen = set()
+    code = getattr(function, "__code__", None)
+    if code is None:
+        return repr(function)
+    if function in seen:
+        return function.__qualname__
+    seen.add(function)
+    fingerprint = [
+        function.__qualname__,
+        _fingerprint_code(code, function.__globals__, seen),
+    ]
+    for cell in function.__closure__ or ():
+        try:
+            value = cell.cell_contents
+        except ValueError:
+            raise _UnkeyableError(function.__qualname__)
+        fingerprint.append(_fingerprint_value(value, seen))
+    return repr(fingerprint)
+
+
+def _fingerprint_value(value, seen: set) -> str:
+    if isinstance(value, _CONSTANT_TYPES):
+        return repr(value)
+    if isinstance(value, (tuple, list)):
+        return repr(
+            (type(value).__name__, [_fingerprint_value(item, seen) for item in value])
+        )
+    if isinstance(value, (set, frozenset)):
+        return repr(
+            (
+                type(value).__name__,
+                sorted(_fingerprint_value(item, seen) for item in value),
+            )
+        )
+    if isinstance(value, dict):
+        return repr(
+            sorted(
+                (_fingerprint_value(key, seen), _fingerprint_value(item, seen))
+                for key, item in value.items()
+            )
+        )
+    if isinstance(value, types.ModuleType):
+        return value.__name__
+    if isinstance(value, (type, types.BuiltinFunctionType)):
+        return f"{value.__module__}.{value.__qualname__}"
+    if isinstance(value, types.FunctionType):
+        return _fingerprint_function(value, seen)
+    raise _UnkeyableError(repr(value))
@@ -8,20 +8,71 @@ import numpy as np
 import abjad
 
 
-@dataclasses.dataclass(frozen=True)
+class _EmptyAttachments(list):
+    """
+    Empty attachments shared by all sound points without any. It equals an
+    empty list, but cannot be changed.
+    """
+
+    __slots__ = ()
+
+    def __hash__(self):
+        return hash(())
+
+    def __reduce__(self):
+        return "_NO_ATTACHMENTS"
+
+    def _raise(self, *arguments, **keywords):
+        raise TypeError("Attachments shared by sound points cannot be changed")
+
+    __delitem__ = __iadd__ = __imul__ = __setitem__ = _raise
+    append = clear = extend = insert = pop = remove = reverse = sort = _raise
+
+
+_NO_ATTACHMENTS = _EmptyAttachments()
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
 class SoundPoint:
     """
     SoundPoint / Event.
+
+    Sound points without attachments share one empty list, which cannot be
+    changed.
+
+    ..  container:: example
+
+        >>> sound_point = pang.SoundPoint(1, 0.5, 0)
+        >>> sound_point.shift(2)
+        SoundPoint(instance=3, duration=0.5, pitch=0, attachments=[])
+
+        >>> sound_point == pang.SoundPoint(1, 0.5, 0, [])
+        True
+
     """
 
     instance: float
     duration: float
-    pitch: float | tuple[float]
-    attachments: list[typing.Any] = dataclasses.field(default_factory=list)
+    pitch: float | tuple[float, ...]
+    attachments: list[typing.Any] = _NO_ATTACHMENTS
+
+    def shift(self, offset: float) -> "SoundPoint":
+        """
+        Makes a copy of the sound point ``offset`` seconds later.
+        """
+        return type(self)(
+            self.instance + offset, self.duration, self.pitch, self.attachments
+        )
 
     @staticmethod
     def from_sound_point(sound_point, /, **changes) -> "SoundPoint":
-        return dataclasses.replace(sound_point, **changes)
+        return type(sound_point)(
+            changes.pop("instance", sound_point.instance),
+            changes.pop("duration", sound_point.duration),
+            changes.pop("pitch", sound_point.pitch),
+            changes.pop("attachments", sound_point.attachments),
+            **changes,
+        )
 
 
 class QueuingProcess(enum.Enum):
@@ -209,9 +260,9 @@ class ManualSoundPointsGenerator(SoundPointsGenerator):
         ...     sound_points_generator, 3.5
         ... )
         >>> print(sequence.instances)
-        [0, 1, 2, 3]
+        [0.0, 1.0, 2.0, 3.0]
         >>> print(sequence.durations)
-        [1, 1, 0.5, 0.5]
+        [1.0, 1.0, 0.5, 0.5]
         >>> print(sequence.sequence_duration)
         3.5
 
@@ -257,9 +308,9 @@ class ManualSoundPointsGenerator(SoundPointsGenerator):
         ...     sound_points_generator, 3.5
         ... )
         >>> print(sequence.instances)
-        [0, 1, 2, 3]
+        [0.0, 1.0, 2.0, 3.0]
         >>> print(sequence.durations)
-        [1, 1, 0.5, 0.5]
+        [1.0, 1.0, 0.5, 0.5]
         >>> print(sequence.pitches)
         [0, 1, (2, 3), 4]
         >>> print(sequence.sequence_duration)
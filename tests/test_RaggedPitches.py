@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+import pang
+
+
+def test_RaggedPitches_round_trip():
+    pitches = [0, 1.5, (2, 7), None, (), (3,)]
+    ragged_pitches = pang.RaggedPitches.from_pitches(pitches)
+    assert ragged_pitches.to_pitches() == pitches
+    assert ragged_pitches.chord_sizes.tolist() == [1, 1, 2, 0, 0, 1]
+    assert len(ragged_pitches) == 6
+
+
+def test_RaggedPitches_minima_maxima_and_within():
+    ragged_pitches = pang.RaggedPitches.from_pitches([5, (9, -2, 4), None, (1,)])
+    assert ragged_pitches.minima.tolist() == [5, -2, np.inf, 1]
+    assert ragged_pitches.maxima.tolist() == [5, 9, -np.inf, 1]
+    assert ragged_pitches.within(0, 5).tolist() == [True, False, True, True]
+
+
+def test_RaggedPitches_transpose():
+    ragged_pitches = pang.RaggedPitches.from_pitches([0, (2, 7), None, 1])
+    assert ragged_pitches.transpose(-1).to_pitches() == [-1, (1, 6), None, 0]
+    assert ragged_pitches.transpose([1, 2, 3, 0.5]).to_pitches() == [
+        1,
+        (4, 9),
+        None,
+        1.5,
+    ]
+
+
+def test_RaggedPitches_equality():
+    ragged_pitches = pang.RaggedPitches.from_pitches([0, (2, 7), None])
+    assert ragged_pitches == pang.RaggedPitches.from_pitches([0, (2, 7), None])
+    assert ragged_pitches != pang.RaggedPitches.from_pitches([0, (2, 8), None])
+    assert ragged_pitches != pang.RaggedPitches.from_pitches([0, 2, 7, None])
+    with pytest.raises(TypeError):
+        hash(ragged_pitches)
+
+
+def test_RaggedPitches_rejects_other_pitches():
+    with pytest.raises(ValueError):
+        pang.RaggedPitches.from_pitches([0, "c'"])
+
+
+def test_Sequence_ragged_pitches():
+    sequence = pang.Sequence.from_arrays([0, 1], [1, 1], 2, pitches=[0, (1, 2)])
+    ragged_pitches = sequence.ragged_pitches
+    assert sequence.ragged_pitches is ragged_pitches
+    sequence.transpose(12)
+    assert sequence.pitches == [12, (13, 14)]
+    assert sequence.ragged_pitches.values.tolist() == [12, 13, 14]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_RangeNoteServer_can_serve_many_matches_can_serve(seed):
+    random_number_generator = np.random.default_rng(seed)
+    pitches = [
+        tuple(random_number_generator.integers(-12, 24, size).tolist())
+        for size in random_number_generator.integers(0, 4, 100)
+    ]
+    pitches[::3] = random_number_generator.uniform(-12, 24, 34).tolist()
+    sequence = pang.Sequence.from_arrays(
+        np.arange(100), np.ones(100), 100, pitches=pitches
+    )
+    server = pang.RangeNoteServer(-5, 12)
+    assert server.can_serve_many(sequence).tolist() == [
+        server.can_serve(sound_point) for sound_point in sequence
+    ]
@@ -1,3 +1,7 @@
+import os
+import stat
+
+import numpy as np
 import pytest
 
 import pang
@@ -136,3 +140,367 @@ def test_Sequence___eq__():
     assert pang.Sequence([], 0) == pang.Sequence([], 0)
     assert pang.Sequence([], 0) != pang.Sequence([], 1)
     assert pang.Sequence(to_sound_points([0, 1], [1, 1]), 2) != pang.Sequence([], 2)
+
+
+def test_Sequence___iter__():
+    sound_points = [
+        pang.SoundPoint(0, 1, 60, {"a": 1}),
+        pang.SoundPoint(1, 1, (60, 64)),
+        pang.SoundPoint(2, 1, None),
+    ]
+    sequence = pang.Sequence(sound_points, 3)
+    iterator = iter(sequence)
+    assert next(iterator) == sound_points[0]
+    assert list(iterator) == sound_points[1:]
+    assert list(sequence) == sequence[:]
+
+
+def test_Sequence_from_arrays():
+    sequence = pang.Sequence.from_arrays(
+        [0, 1, 2], [0.5, 0.5, 1], 3, pitches=[0, (1, 2), 3], attachments={1: ["a"]}
+    )
+    assert sequence == pang.Sequence(
+        [
+            pang.SoundPoint(0, 0.5, 0),
+            pang.SoundPoint(1, 0.5, (1, 2), ["a"]),
+            pang.SoundPoint(2, 1, 3),
+        ],
+        3,
+    )
+    assert sequence[-1] == pang.SoundPoint(2, 1, 3)
+    assert sequence.attachments == [[], ["a"], []]
+
+
+def test_Sequence_from_arrays_with_out_of_order_instances_raises_exception():
+    with pytest.raises(ValueError) as exception_info:
+        pang.Sequence.from_arrays([1, 0], [1, 1], 2)
+    assert "out of order" in str(exception_info.value)
+
+
+def test_Sequence_array_accessors_are_read_only():
+    sequence = pang.Sequence.from_arrays([0, 1], [1, 1], 2)
+    with pytest.raises(ValueError):
+        sequence.instances_array[0] = 1
+    with pytest.raises(ValueError):
+        sequence.durations_array[0] = 2
+    assert sequence.instances == [0, 1]
+
+
+def test_Sequence_extend_keeps_attachments():
+    sequence_0 = pang.Sequence([pang.SoundPoint(0, 1, 0, ["a"])], 1)
+    sequence_1 = pang.Sequence(
+        [pang.SoundPoint(0, 1, 0), pang.SoundPoint(0.5, 1, 0, ["b"])], 1
+    )
+    sequence_0.extend(sequence_1)
+    assert sequence_0.attachments == [["a"], [], ["b"]]
+
+
+def test_Sequence_superpose_keeps_tie_order():
+    sequence_0 = pang.Sequence(to_sound_points([0, 1, 1], [1, 1, 1], [0, 1, 2]), 2)
+    sequence_1 = pang.Sequence(to_sound_points([0, 0, 1], [1, 1, 1], [3, 4, 5]), 2)
+    sequence_0.superpose(0, sequence_1)
+    assert sequence_0.pitches == [4, 3, 0, 5, 1, 2]
+
+
+def test_Sequence_merge():
+    sequences = [
+        pang.Sequence(to_sound_points([0, 1], [1, 1], [layer, layer]), 2)
+        for layer in range(3)
+    ]
+    sequence = pang.Sequence.merge([0, 1, 0], sequences)
+    assert sequence.instances == [0, 0, 1, 1, 1, 2]
+    assert sequence.pitches == [0, 2, 0, 1, 2, 1]
+    assert sequence.sequence_duration == 3
+
+
+def test_Sequence_merge_matches_superpose_of_reversed_sequence():
+    sequence_0 = pang.Sequence(to_sound_points([0, 1, 1], [1, 1, 1], [0, 1, 2]), 2)
+    sequence_1 = pang.Sequence(to_sound_points([0, 1, 1.5], [1, 1, 1], [3, 4, 5]), 2)
+    merged = pang.Sequence.merge([0.5, 0], [sequence_1, sequence_0])
+    sequence_0.superpose(0.5, sequence_1)
+    assert merged.instances == sequence_0.instances
+    assert merged.pitches == sequence_0.pitches
+
+
+def test_Sequence_insert_many_motifs():
+    motif = pang.Sequence(to_sound_points([0, 0.25], [0.25, 0.25], [1, 2]), 0.5)
+    sequence = pang.Sequence(to_sound_points([0, 1, 2, 3], [1, 1, 1, 1]), 4)
+    for offset in [3, 2, 1]:
+        sequence.insert(offset, motif)
+    sequence.extend(motif)
+    assert sequence.instances == [
+        0,
+        1,
+        1.25,
+        1.5,
+        2.5,
+        2.75,
+        3,
+        4,
+        4.25,
+        4.5,
+        5.5,
+        5.75,
+    ]
+    assert sequence.pitches == [(), 1, 2, (), 1, 2, (), 1, 2, (), 1, 2]
+    assert sequence.sequence_duration == 6
+    assert len(sequence) == 12
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_Sequence_insert_and_extend_match_shifting_sound_points(seed):
+    random_number_generator = np.random.default_rng(seed)
+
+    def make_sound_points(size, duration):
+        instances = np.sort(random_number_generator.uniform(0, duration, size))
+        return to_sound_points(instances.tolist(), [0.1] * size, list(range(size)))
+
+    sound_points = make_sound_points(20, 3.3)
+    duration = 3.3
+    sequence = pang.Sequence(sound_points, duration)
+    for _ in range(30):
+        operand_duration = float(random_number_generator.uniform(0.1, 1.3))
+        operand_sound_points = make_sound_points(3, operand_duration)
+        operand = pang.Sequence(operand_sound_points, operand_duration)
+        offset = float(random_number_generator.uniform(0, duration))
+        if random_number_generator.random() < 0.5:
+            index = sum(sound_point.instance < offset for sound_point in sound_points)
+            sound_points = [
+                *sound_points[:index],
+                *(sound_point.shift(offset) for sound_point in operand_sound_points),
+                *(
+                    sound_point.shift(operand_duration)
+                    for sound_point in sound_points[index:]
+                ),
+            ]
+            sequence.insert(offset, operand)
+            duration += operand_duration
+        else:
+            sound_points = [
+                *sound_points,
+                *(
+                    sound_point.shift(duration + offset)
+                    for sound_point in operand_sound_points
+                ),
+            ]
+            sequence.extend(operand, offset)
+            duration += operand_duration + offset
+    assert sequence.instances == [sound_point.instance for sound_point in sound_points]
+    assert sequence == pang.Sequence(sound_points, duration)
+
+
+def _apply_operations(sequence, operations):
+    for name, offset, operand in operations:
+        if name == "extend":
+            sequence.extend(operand, offset)
+        else:
+            getattr(sequence, name)(offset, operand)
+
+
+def test_LazySequence_matches_eager_operations():
+    motif = pang.Sequence(to_sound_points([0, 0.25], [0.25, 0.25], [1, 2]), 0.5)
+    operations = [
+        ("superpose", 1, motif),
+        ("superpose", 1, motif),
+        ("extend", 0.5, motif),
+        ("superpose", 4.5, motif),
+        ("insert", 2, motif),
+        ("superpose", 0, motif),
+        ("extend", 0, motif),
+    ]
+    lazy_sequence = pang.LazySequence(
+        pang.Sequence(to_sound_points([0, 1, 2, 3], [1, 1, 1, 1]), 4)
+    )
+    _apply_operations(lazy_sequence, operations)
+    sequence = pang.Sequence(to_sound_points([0, 1, 2, 3], [1, 1, 1, 1]), 4)
+    _apply_operations(sequence, operations)
+    assert lazy_sequence.sequence_duration == sequence.sequence_duration
+    assert lazy_sequence.materialize() == sequence
+
+
+def test_LazySequence_superposes_and_extends_without_rebuilding(monkeypatch):
+    motif = pang.Sequence(to_sound_points([0, 0.25], [0.25, 0.25], [1, 2]), 0.5)
+    operations = [("superpose", 3.75, motif), ("extend", 0, motif)] * 50
+    lazy_sequence = pang.LazySequence(
+        pang.Sequence(to_sound_points([0, 1, 2, 3], [1, 1, 1, 1]), 4)
+    )
+    _apply_operations(lazy_sequence, operations)
+    number_of_rebuilds = 0
+    set_columns = pang.Sequence._set_columns
+
+    def count_rebuilds(sequence, *columns):
+        nonlocal number_of_rebuilds
+        number_of_rebuilds += 1
+        set_columns(sequence, *columns)
+
+    monkeypatch.setattr(pang.Sequence, "_set_columns", count_rebuilds)
+    materialized_sequence = lazy_sequence.materialize()
+    monkeypatch.undo()
+    assert number_of_rebuilds <= 2
+    sequence = pang.Sequence(to_sound_points([0, 1, 2, 3], [1, 1, 1, 1]), 4)
+    _apply_operations(sequence, operations)
+    assert materialized_sequence == sequence
+
+
+def test_LazySequence_with_lazy_operands():
+    motif = pang.Sequence(to_sound_points([0, 0.25], [0.25, 0.25], [1, 2]), 0.5)
+    lazy_motif = pang.LazySequence.from_sequences([motif, motif])
+    lazy_motif.superpose(0.25, motif)
+    base = pang.Sequence(to_sound_points([0, 1], [1, 1], [0, 0]), 2)
+    lazy_sequence = pang.LazySequence(base)
+    lazy_sequence.insert(1, lazy_motif)
+    lazy_sequence.superpose(0, lazy_motif)
+    eager_motif = pang.Sequence.from_sequences([motif, motif])
+    eager_motif.superpose(0.25, motif)
+    sequence = pang.Sequence(to_sound_points([0, 1], [1, 1], [0, 0]), 2)
+    sequence.insert(1, eager_motif)
+    sequence.superpose(0, eager_motif)
+    assert lazy_sequence.materialize() == sequence
+    assert lazy_sequence.materialize() == sequence
+    assert base.instances == [0, 1]
+
+
+def test_Sequence_window():
+    sequence = pang.Sequence.from_arrays(
+        [0, 1, 1, 2.5, 4], [1, 1, 1, 1, 1], 5, attachments={2: ["a"], 3: ["b"]}
+    )
+    window = sequence.window(1, 4)
+    assert window.instances == [0, 0, 1.5]
+    assert window.attachments == [[], ["a"], ["b"]]
+    assert window.sequence_duration == 3
+    assert len(sequence.window(1.5, 2.5)) == 0
+    assert sequence.window(0, 5) == sequence
+    with pytest.raises(ValueError):
+        sequence.window(2, 1)
+
+
+def test_Sequence_at():
+    sequence = pang.Sequence.from_arrays(
+        [0, 0.5, 1, 3], [1, 3, 0.5, 1], 4, pitches=[0, 1, 2, 3]
+    )
+    assert [sound_point.pitch for sound_point in sequence.at(1)] == [1, 2]
+    assert [sound_point.pitch for sound_point in sequence.at(3.25)] == [1, 3]
+    assert sequence.at(4) == []
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_Sequence_at_matches_scanning_every_sound_point(seed):
+    rng = np.random.default_rng(seed)
+    instances = np.sort(rng.uniform(0, 20, 300))
+    durations = rng.exponential(0.2, 300)
+    durations[rng.integers(0, 300)] = 30
+    sequence = pang.Sequence.from_arrays(instances, durations, 20)
+    for time in [*rng.uniform(-1, 25, 50), *instances[:10], 50]:
+        assert sequence.at(time) == [
+            sound_point
+            for sound_point in sequence
+            if sound_point.instance
+            <= time
+            < sound_point.instance + sound_point.duration
+        ]
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_Sequence_save_and_load(tmp_path, mmap):
+    sequence = pang.Sequence.from_arrays(
+        [0, 0.5, 1, 1.5, 2],
+        [0.5, 0.5, 0.5, 0.5, 1],
+        3,
+        pitches=[0, 1.5, (2, 3.25), None, "c'"],
+        attachments={1: ["a"], 4: [{"b": 1}]},
+    )
+    path = tmp_path / "sequence.pangseq"
+    sequence.save(path)
+    loaded = pang.Sequence.load(path, mmap=mmap)
+    assert loaded == sequence
+    assert [type(pitch) for pitch in loaded.pitches[:2]] == [int, float]
+    assert isinstance(loaded.instances_array.base, np.memmap) == mmap
+    assert loaded.window(1, 3) == sequence.window(1, 3)
+
+
+def test_Sequence_load_keeps_pitches_encoded(tmp_path, monkeypatch):
+    sequence = pang.Sequence.from_arrays(
+        [0, 0.5, 1, 1.5], [0.5, 0.5, 0.5, 0.5], 2, pitches=[0, 1.5, (2, 3.25), None]
+    )
+    path = tmp_path / "sequence.pangseq"
+    sequence.save(path)
+    loaded = pang.Sequence.load(path)
+
+    def fail(*arguments):
+        raise AssertionError("The pitches should not have been decoded")
+
+    monkeypatch.setattr(pang.sequences, "_decode_pitches", fail)
+    ragged_pitches = loaded.ragged_pitches
+    assert isinstance(ragged_pitches.values, np.memmap)
+    assert ragged_pitches.minima.tolist() == [0, 1.5, 2, np.inf]
+    assert ragged_pitches.maxima.tolist() == [0, 1.5, 3.25, -np.inf]
+    assert loaded.fingerprint() == sequence.fingerprint()
+    monkeypatch.undo()
+    assert loaded.pitches == [0, 1.5, (2, 3.25), None]
+
+
+def test_Sequence_save_and_load_empty_sequence(tmp_path):
+    path = tmp_path / "sequence.pangseq"
+    pang.Sequence.empty_sequence().save(path)
+    assert pang.Sequence.load(path) == pang.Sequence.empty_sequence()
+
+
+def test_Sequence_save_uses_default_permissions(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        path = tmp_path / "sequence.pangseq"
+        pang.Sequence.empty_sequence().save(path)
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+
+def test_Sequence_save_removes_temporary_file_on_failure(tmp_path, monkeypatch):
+    def fail(*arguments):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(pang.sequences, "_align", fail)
+    with pytest.raises(OSError):
+        pang.Sequence.empty_sequence().save(tmp_path / "sequence.pangseq")
+    assert not list(tmp_path.iterdir())
+
+
+def test_Sequence_load_rejects_other_files(tmp_path):
+    path = tmp_path / "sequence.pangseq"
+    path.write_bytes(b"not a sequence")
+    with pytest.raises(ValueError):
+        pang.Sequence.load(path)
+
+
+def test_Sequence_fingerprint():
+    def make_sequence(pitches):
+        return pang.Sequence.from_arrays(
+            [0, 1, 2], [1, 1, 1], 3, pitches=pitches, attachments={1: ["a"]}
+        )
+
+    sequence = make_sequence([0, (1, 2), None])
+    fingerprint = sequence.fingerprint()
+    assert make_sequence([0, (1, 2), None]).fingerprint() == fingerprint
+    assert make_sequence([0.0, (1, 2), None]).fingerprint() != fingerprint
+    assert make_sequence([0, (1,), None]).fingerprint() != fingerprint
+    assert sequence.window(0, 3).fingerprint() == fingerprint
+    sequence.insert(1, make_sequence([0, 1, 2]))
+    inserted_fingerprint = sequence.fingerprint()
+    assert inserted_fingerprint != fingerprint
+    assert sequence.instances_array[-1] == 5
+    assert sequence.fingerprint() == inserted_fingerprint
+    sequence.superpose(0, make_sequence([0, 1, 2]))
+    assert sequence.fingerprint() != inserted_fingerprint
+
+
+def test_Sequence_update_attachments():
+    sequence = pang.Sequence.from_arrays([0, 1, 2], [1, 1, 1], 3)
+    instances = sequence.instances_array
+    fingerprint = sequence.fingerprint()
+    sequence.update_attachments({-1: ["a"], 0: []})
+    assert sequence.attachments == [[], [], ["a"]]
+    assert dict(sequence.sparse_attachments) == {2: ["a"]}
+    assert sequence.instances_array.base is instances.base
+    assert sequence.fingerprint() != fingerprint
+    with pytest.raises(IndexError):
+        sequence.update_attachments({3: ["b"]})
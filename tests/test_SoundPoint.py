@@ -0,0 +1,39 @@
+import pickle
+
+import pytest
+
+import pang
+
+
+def test_SoundPoint_without_attachments_shares_empty_attachments():
+    sound_point_0 = pang.SoundPoint(0, 1, 0)
+    sound_point_1 = pang.SoundPoint(1, 1, 0)
+    assert sound_point_0.attachments is sound_point_1.attachments
+    assert sound_point_0.attachments == []
+    assert sound_point_0 == pang.SoundPoint(0, 1, 0, [])
+    assert not hasattr(sound_point_0, "__dict__")
+    with pytest.raises(TypeError):
+        sound_point_0.attachments.append("a")
+
+
+def test_SoundPoint_shift():
+    sound_point = pang.SoundPoint(1, 0.5, (0, 4), ["a"])
+    shifted_sound_point = sound_point.shift(-0.5)
+    assert shifted_sound_point == pang.SoundPoint(0.5, 0.5, (0, 4), ["a"])
+    assert shifted_sound_point == pang.SoundPoint.from_sound_point(
+        sound_point, instance=0.5
+    )
+    with pytest.raises(TypeError):
+        pang.SoundPoint.from_sound_point(sound_point, offset=0.5)
+
+
+def test_SoundPoint_pattern_matching_and_pickling():
+    sound_point = pang.SoundPoint(1, 0.5, 2)
+    match sound_point:
+        case pang.SoundPoint(instance, duration, pitch, []):
+            assert (instance, duration, pitch) == (1, 0.5, 2)
+        case _:
+            pytest.fail()
+    unpickled_sound_point = pickle.loads(pickle.dumps(sound_point))
+    assert unpickled_sound_point == sound_point
+    assert unpickled_sound_point.attachments is sound_point.attachments
@@ -1,3 +1,7 @@
+import json
+
+import pytest
+
 import abjad
 import pang
 
@@ -20,6 +24,20 @@ def test_collect_metadata() -> None:
     assert voice_metadata["number_of_discarded_pitched_q_events"] == 0
 
 
+def test_write_metadata_keeps_previous_metadata_on_failure(tmp_path) -> None:
+    path = tmp_path / pang.build.METADATA_FILE_NAME
+    queue_state = pang.QueueState(
+        (0.5,), (pang.SoundPoint(-1, 1, 60, [abjad.Dynamic("p")]),)
+    )
+    pang.build._write_metadata({"queue_state": queue_state.asdict()}, path)
+    with pytest.raises(TypeError):
+        pang.build._write_metadata({"queue_state": queue_state}, path)
+    assert [path.name for path in tmp_path.iterdir()] == [path.name]
+    with open(path) as fp:
+        metadata = json.load(fp)
+    assert pang.QueueState.from_dict(metadata["queue_state"]) == queue_state
+
+
 def make_score() -> abjad.Score:
     voice = abjad.Voice("c'4 c'4 c'4 c'8 r8", name=VOICE_NAME)
     first_leaf = pang.get.leaf(voice, 0)
@@ -1,3 +1,9 @@
+import typing
+
+import nauert
+import numpy as np
+import pytest
+
 import pang
 
 
@@ -7,3 +13,124 @@ def test_noteserver_serve() -> None:
     assert server.durations == [1.0, 0.5]
     assert server.pitches == [None, 0]
     assert server.offset_instance == 1.5
+
+
+def test_noteserver_can_serve_many() -> None:
+    class EvenNoteServer(pang.NoteServer):
+        def can_serve(self, sound_point: pang.SoundPoint) -> bool:
+            pitch = sound_point.pitch
+            return isinstance(pitch, (int, float)) and pitch % 2 == 0
+
+    sequence = pang.Sequence(
+        [
+            pang.SoundPoint(instance, 1, pitch)
+            for instance, pitch in enumerate(range(4))
+        ],
+        4,
+    )
+    assert EvenNoteServer().can_serve_many(sequence).tolist() == [
+        True,
+        False,
+        True,
+        False,
+    ]
+
+
+def test_noteserver_keeps_chords_and_attachments() -> None:
+    server = pang.NoteServer()
+    for index in range(40):
+        server.serve(
+            index,
+            pang.SoundPoint(index, 0.5, (60, 64) if index % 3 else 60.5, [index]),
+        )
+    assert len(server.durations) == 79
+    assert server.durations[:4] == [0.5, 0.5, 0.5, 0.5]
+    assert server.pitches[:4] == [60.5, None, (60, 64), None]
+    assert server.attachments[:4] == [[0], (), [1], ()]
+    assert server.durations_in_millisecond[:2] == [500.0, 500.0]
+    assert server.offset_instance == 39.5
+
+
+def test_noteserver_serves_many_pitches_of_every_kind() -> None:
+    pitches: list[typing.Any] = [
+        0,
+        1.5,
+        None,
+        (60, 64),
+        np.int64(3),
+        np.float32(2.5),
+        "c'",
+        7,
+    ]
+    sound_points = [
+        pang.SoundPoint(instance, 0.5, pitch) for instance, pitch in enumerate(pitches)
+    ]
+    sequence = pang.Sequence(sound_points, len(pitches))
+    (server,) = pang.simulate_queue(sequence, (pang.NoteServer(),))
+    reference_server = pang.NoteServer()
+    for sound_point in sound_points:
+        reference_server.serve(sound_point.instance, sound_point)
+    assert server.pitches == reference_server.pitches
+    assert [type(pitch) for pitch in server.pitches] == [
+        type(pitch) for pitch in reference_server.pitches
+    ]
+
+
+def test_noteserver_q_event_sequence_matches_nauert() -> None:
+    server = pang.NoteServer()
+    server.rest(0.25)
+    server.serve(0.5, pang.SoundPoint(0, 0.3, (60, 64), ["a"]))
+    server.serve(0.8, pang.SoundPoint(0, 0.1, 62))
+    server.rest(0.7)
+    server.serve(2.0, pang.SoundPoint(0, 0.15, 61.5))
+    q_event_sequence = server.q_event_sequence
+    expected = nauert.QEventSequence.from_millisecond_pitch_attachment_tuples(
+        tuple(zip(server.durations_in_millisecond, server.pitches, server.attachments))
+    )
+    assert [repr(q_event) for q_event in q_event_sequence] == [
+        repr(q_event) for q_event in expected
+    ]
+    assert server.q_event_sequence is q_event_sequence
+    server.serve(3.0, pang.SoundPoint(0, 0.5, 60))
+    assert server.q_event_sequence is not q_event_sequence
+    assert len(server.q_event_sequence) == len(q_event_sequence) + 2
+
+
+def test_noteserver_absorbs_gaps_below_rest_threshold() -> None:
+    server = pang.NoteServer(rest_threshold=0.1)
+    server.serve(0.05, pang.SoundPoint(0, 0.5, 0))
+    server.serve(0.6, pang.SoundPoint(0, 0.5, 1))
+    server.serve(1.5, pang.SoundPoint(0, 0.5, 2))
+    assert server.durations == pytest.approx([0.6, 0.5, 0.4, 0.5])
+    assert server.pitches == [0, 1, None, 2]
+    assert server.offset_instance == 2.0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_noteserver_rest_threshold_in_simulation_matches_reference(seed) -> None:
+    random_number_generator = np.random.default_rng(seed)
+    instances = np.sort(random_number_generator.uniform(0, 20, 100)).tolist()
+    durations = random_number_generator.exponential(0.2, 100).tolist()
+    sequence = pang.Sequence(
+        [
+            pang.SoundPoint(instance, duration, pitch)
+            for pitch, (instance, duration) in enumerate(zip(instances, durations))
+        ],
+        20,
+    )
+    servers = pang.simulate_queue(
+        sequence, tuple(pang.NoteServer(rest_threshold=0.1) for _ in range(2))
+    )
+    reference_servers = pang.simulate_queue(
+        sequence,
+        tuple(pang.NoteServer(rest_threshold=0.1) for _ in range(2)),
+        pang.SimulationMode.REFERENCE,
+    )
+    for server, reference_server in zip(servers, reference_servers):
+        assert server.durations == reference_server.durations
+        assert server.pitches == reference_server.pitches
+        assert all(
+            duration >= 0.1
+            for duration, pitch in zip(server.durations, server.pitches)
+            if pitch is None
+        )
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+import pang
+
+from .utils import to_sound_points
+
+
+class SingleNoteServer0(pang.NoteServer):
+    def can_serve(self, sound_point: pang.SoundPoint) -> bool:
+        return sound_point.pitch == 0
+
+
+@pytest.mark.parametrize(
+    "mode", [pang.SimulationMode.REFERENCE, pang.SimulationMode.EVENT_DRIVEN]
+)
+def test_ServiceLog_records_starts_and_servers(mode):
+    sequence = pang.Sequence(
+        to_sound_points([0, 1, 2, 3], [2.5, 0.5, 0.5, 0.5], [0, 0, 1, 1]), 10
+    )
+    _, service_log = pang.simulate_queue_with_service_log(
+        sequence, (SingleNoteServer0(), pang.NoteServer()), mode
+    )
+    assert service_log.starts.tolist() == [0, 1, 2, 3]
+    assert service_log.server_indices.tolist() == [0, 1, 1, 1]
+    assert service_log.ends.tolist() == [2.5, 1.5, 2.5, 3.5]
+    assert service_log.waits.tolist() == [0, 0, 0, 0]
+    np.testing.assert_almost_equal(service_log.utilizations, [2.5 / 3.5, 1.5 / 3.5])
+
+
+def test_ServiceLog_queue_lengths():
+    sequence = pang.Sequence(to_sound_points([0, 0.5, 1, 3], [1, 1, 1, 1]), 4)
+    _, service_log = pang.simulate_queue_with_service_log(
+        sequence, (pang.NoteServer(),)
+    )
+    instances, lengths = service_log.queue_lengths()
+    assert instances.tolist() == [0, 0.5, 1, 2, 3]
+    assert lengths.tolist() == [0, 1, 1, 0, 0]
+    assert service_log.mean_queue_length == pytest.approx(1.5 / 4)
+    assert service_log.max_wait == 1
+
+
+def test_ServiceLog_of_empty_sequence():
+    _, service_log = pang.simulate_queue_with_service_log(
+        pang.Sequence.empty_sequence(), (pang.NoteServer(),)
+    )
+    assert len(service_log) == 0
+    assert service_log.mean_wait == 0
+    assert service_log.utilizations.tolist() == [0]
+
+
+def test_ServiceLog_equality():
+    sequence = pang.Sequence(to_sound_points([0, 0.5, 1, 3], [1, 1, 1, 1]), 4)
+    _, service_log = pang.simulate_queue_with_service_log(
+        sequence, (pang.NoteServer(),)
+    )
+    _, same_service_log = pang.simulate_queue_with_service_log(
+        sequence, (pang.NoteServer(),)
+    )
+    _, other_service_log = pang.simulate_queue_with_service_log(
+        sequence, (pang.NoteServer(), pang.NoteServer())
+    )
+    assert service_log == same_service_log
+    assert service_log != other_service_log
+    _, merged_service_log = pang.simulate_queue_with_service_log(
+        (sequence, sequence), (pang.NoteServer(),)
+    )
+    assert merged_service_log.for_source(0) != merged_service_log.for_source(1)
+    assert service_log != merged_service_log
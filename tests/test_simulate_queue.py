@@ -3,7 +3,7 @@ import pytest
 
 import pang
 
-from .utils import to_sound_points
+from .utils import make_random_sound_points, to_sound_points
 
 
 class SingleNoteServer0(pang.NoteServer):
@@ -149,3 +149,403 @@ def test_simulate_queue_raises_exception_if_non_servable_sound_point_exists():
     sequence = pang.Sequence(to_sound_points(instances, durations, pitches), 10)
     with pytest.raises(pang.NotServableException):
         pang.simulate_queue(sequence, (SingleNoteServer0(),))
+
+
+class LowNoteServer(pang.NoteServer):
+    def can_serve(self, sound_point: pang.SoundPoint) -> bool:
+        pitch = sound_point.pitch
+        return isinstance(pitch, (int, float)) and pitch < 6
+
+
+class HighNoteServer(pang.NoteServer):
+    def can_serve(self, sound_point: pang.SoundPoint) -> bool:
+        pitch = sound_point.pitch
+        return isinstance(pitch, (int, float)) and pitch >= 3
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_simulate_queue_event_driven_mode_matches_reference_mode(seed):
+    sequence = pang.Sequence(make_random_sound_points(seed), 20)
+
+    reference_servers = pang.simulate_queue(
+        sequence,
+        (LowNoteServer(), HighNoteServer(), pang.NoteServer(), LowNoteServer()),
+        pang.SimulationMode.REFERENCE,
+    )
+    event_driven_servers = pang.simulate_queue(
+        sequence,
+        (LowNoteServer(), HighNoteServer(), pang.NoteServer(), LowNoteServer()),
+        pang.SimulationMode.EVENT_DRIVEN,
+    )
+    for reference_server, event_driven_server in zip(
+        reference_servers, event_driven_servers
+    ):
+        assert reference_server.durations == event_driven_server.durations
+        assert reference_server.pitches == event_driven_server.pitches
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_simulate_queue_single_server_fast_path_matches_reference_mode(seed):
+    sequence = pang.Sequence(make_random_sound_points(seed, mean_duration=0.1), 20)
+
+    (reference_server,) = pang.simulate_queue(
+        sequence, (pang.NoteServer(),), pang.SimulationMode.REFERENCE
+    )
+    (server,) = pang.simulate_queue(sequence, (pang.NoteServer(),))
+    np.testing.assert_almost_equal(server.durations, reference_server.durations)
+    assert server.pitches == reference_server.pitches
+    assert server.attachments == reference_server.attachments
+    assert server.offset_instance == pytest.approx(reference_server.offset_instance)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_simulate_queue_identical_servers_fast_path_matches_reference_mode(seed):
+    sequence = pang.Sequence(make_random_sound_points(seed), 20)
+
+    reference_servers = pang.simulate_queue(
+        sequence,
+        (pang.NoteServer(), pang.NoteServer(), pang.NoteServer()),
+        pang.SimulationMode.REFERENCE,
+    )
+    servers = pang.simulate_queue(
+        sequence, (pang.NoteServer(), pang.NoteServer(), pang.NoteServer())
+    )
+    for reference_server, server in zip(reference_servers, servers):
+        assert server.durations == reference_server.durations
+        assert server.pitches == reference_server.pitches
+        assert server.attachments == reference_server.attachments
+        assert server.offset_instance == reference_server.offset_instance
+
+
+class BatchSingleNoteServer0(pang.NoteServer):
+    def can_serve(self, sound_point: pang.SoundPoint) -> bool:
+        raise AssertionError("can_serve_many should have been used instead")
+
+    def can_serve_many(self, sequence: pang.Sequence) -> np.ndarray:
+        return np.array(sequence.pitches) == 0
+
+
+def test_simulate_queue_uses_can_serve_many():
+    instances = [0, 1, 2, 3]
+    durations = [2.5, 0.5, 0.5, 0.5]
+    pitches = [0, 0, 1, 1]
+    sequence = pang.Sequence(to_sound_points(instances, durations, pitches), 10)
+    server0, server1 = pang.simulate_queue(
+        sequence, (BatchSingleNoteServer0(), SingleNoteServer1())
+    )
+    np.testing.assert_almost_equal(server0.durations, [2.5, 0.5])
+    assert server0.pitches == [0, 0]
+    np.testing.assert_almost_equal(server1.durations, [2.0, 0.5, 0.5, 0.5])
+    assert server1.pitches == [None, 1, None, 1]
+
+
+def test_simulate_queue_with_range_servers_matches_reference_mode():
+    random_number_generator = np.random.default_rng(0)
+    instances = np.sort(random_number_generator.uniform(0, 20, 200)).tolist()
+    durations = random_number_generator.exponential(0.5, 200).tolist()
+    pitches = [
+        tuple(chord) if len(chord) > 1 else chord[0]
+        for chord in (
+            random_number_generator.integers(-12, 24, size).tolist()
+            for size in random_number_generator.integers(1, 4, 200)
+        )
+    ]
+    sequence = pang.Sequence(to_sound_points(instances, durations, pitches), 20)
+
+    def make_servers():
+        return (
+            pang.RangeNoteServer(-12, 12),
+            pang.RangeNoteServer(0, 24),
+            pang.RangeNoteServer(-12, 24),
+            pang.RangeNoteServer(0, 12),
+        )
+
+    reference_servers = pang.simulate_queue(
+        sequence, make_servers(), pang.SimulationMode.REFERENCE
+    )
+    servers = pang.simulate_queue(sequence, make_servers())
+    for reference_server, server in zip(reference_servers, servers):
+        assert server.durations == reference_server.durations
+        assert server.pitches == reference_server.pitches
+
+
+def test_simulate_queue_serves_sound_points_without_pitch_on_every_path():
+    sequence = pang.Sequence(to_sound_points([0, 0.5, 1], [1, 1, 1], [0, None, 7]), 2)
+    server = pang.RangeNoteServer(0, 12)
+    assert server.can_serve(sequence[1])
+    assert server.can_serve_many(sequence).tolist() == [True, True, True]
+    reference_servers = pang.simulate_queue(
+        sequence,
+        (pang.RangeNoteServer(0, 12), pang.RangeNoteServer(0, 12)),
+        pang.SimulationMode.REFERENCE,
+    )
+    servers = pang.simulate_queue(
+        sequence, (pang.RangeNoteServer(0, 12), pang.RangeNoteServer(0, 12))
+    )
+    for reference_server, server in zip(reference_servers, servers):
+        assert server.durations == reference_server.durations
+        assert server.pitches == reference_server.pitches
+    stream = pang.simulate_queue_stream(list(sequence), (pang.RangeNoteServer(0, 12),))
+    assert [served.start for served in stream] == [0, 1, 2]
+
+
+def test_simulate_queue_raises_exception_if_out_of_every_range():
+    sequence = pang.Sequence(to_sound_points([0, 1], [1, 1], [0, 13]), 10)
+    with pytest.raises(pang.NotServableException):
+        pang.simulate_queue(sequence, (pang.RangeNoteServer(0, 12),))
+
+
+@pytest.mark.parametrize(
+    "discipline, pitches",
+    [
+        (pang.QueueDiscipline.FIFO, [0, 1, 2, 3]),
+        (pang.QueueDiscipline.LIFO, [0, 3, 2, 1]),
+        (pang.QueueDiscipline.SHORTEST_DURATION_FIRST, [0, 2, 3, 1]),
+        (pang.QueueDiscipline.LOWEST_PITCH_FIRST, [0, 1, 2, 3]),
+        (pang.QueueDiscipline.HIGHEST_PITCH_FIRST, [0, 3, 2, 1]),
+        (lambda sound_point: sound_point.attachments[0], [0, 2, 1, 3]),
+    ],
+)
+def test_simulate_queue_with_queue_disciplines(discipline, pitches):
+    sound_points = [
+        pang.SoundPoint(0, 2, 0, [0]),
+        pang.SoundPoint(0.5, 0.5, 1, [2]),
+        pang.SoundPoint(1, 0.25, 2, [1]),
+        pang.SoundPoint(1.5, 0.375, 3, [3]),
+    ]
+    sequence = pang.Sequence(sound_points, 4)
+    (server,) = pang.simulate_queue(
+        sequence, (pang.NoteServer(),), discipline=discipline
+    )
+    assert server.pitches == pitches
+
+
+def test_simulate_queue_reference_mode_raises_exception_if_not_fifo():
+    sequence = pang.Sequence(to_sound_points([0, 1], [1, 1], [0, 0]), 2)
+    with pytest.raises(ValueError):
+        pang.simulate_queue(
+            sequence,
+            (pang.NoteServer(),),
+            pang.SimulationMode.REFERENCE,
+            pang.QueueDiscipline.LIFO,
+        )
+
+
+@pytest.mark.parametrize(
+    "discipline",
+    [
+        pang.QueueDiscipline.FIFO,
+        pang.QueueDiscipline.LIFO,
+        pang.QueueDiscipline.SHORTEST_DURATION_FIRST,
+        pang.QueueDiscipline.HIGHEST_PITCH_FIRST,
+    ],
+)
+def test_simulate_queue_stream_matches_simulate_queue(discipline):
+    sound_points = make_random_sound_points(0)
+    servers = (pang.RangeNoteServer(0, 7), pang.RangeNoteServer(4, 11))
+    served_sound_points = list(
+        pang.simulate_queue_stream(iter(sound_points), servers, discipline)
+    )
+    assert all(server.is_empty for server in servers)
+    servers, service_log = pang.simulate_queue_with_service_log(
+        pang.Sequence(sound_points, 20), servers, discipline=discipline
+    )
+    order = np.argsort(service_log.starts, kind="stable")
+    assert [served.start for served in served_sound_points] == pytest.approx(
+        service_log.starts[order].tolist()
+    )
+    assert [
+        servers.index(served.server) for served in served_sound_points
+    ] == service_log.server_indices[order].tolist()
+    assert [served.pitch for served in served_sound_points] == [
+        sound_points[index].pitch for index in order
+    ]
+
+
+def test_simulate_queue_stream_raises_exception_on_unservable_sound_point():
+    sound_points = to_sound_points([0, 1], [1, 1], [0, 13])
+    stream = pang.simulate_queue_stream(sound_points, (pang.RangeNoteServer(0, 12),))
+    with pytest.raises(pang.NotServableException):
+        list(stream)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+@pytest.mark.parametrize(
+    "discipline",
+    [
+        pang.QueueDiscipline.FIFO,
+        pang.QueueDiscipline.LIFO,
+        pang.QueueDiscipline.SHORTEST_DURATION_FIRST,
+    ],
+)
+def test_simulate_queue_parallel_mode_matches_event_driven_mode(
+    max_workers, discipline
+):
+    sequence = pang.Sequence(make_random_sound_points(0, 300, 100, 0.2), 100)
+    event_driven_servers, event_driven_service_log = (
+        pang.simulate_queue_with_service_log(
+            sequence,
+            (pang.RangeNoteServer(0, 7), pang.RangeNoteServer(4, 11)),
+            discipline=discipline,
+        )
+    )
+    parallel_servers, parallel_service_log = pang.simulate_queue_with_service_log(
+        sequence,
+        (pang.RangeNoteServer(0, 7), pang.RangeNoteServer(4, 11)),
+        pang.SimulationMode.PARALLEL,
+        discipline,
+        max_workers,
+    )
+    assert parallel_service_log.starts.tolist() == (
+        event_driven_service_log.starts.tolist()
+    )
+    assert parallel_service_log.server_indices.tolist() == (
+        event_driven_service_log.server_indices.tolist()
+    )
+    for parallel_server, event_driven_server in zip(
+        parallel_servers, event_driven_servers
+    ):
+        assert parallel_server.durations == event_driven_server.durations
+        assert parallel_server.pitches == event_driven_server.pitches
+
+
+def test_simulate_queue_parallel_mode_splits_only_where_idle():
+    instances = np.array([0, 0.5, 3, 3.5, 4.5, 10])
+    durations = np.array([1, 1, 1, 1, 1, 1])
+    split_indices = pang.queuesimulation._get_idle_split_indices(
+        instances, durations, [0.0, 0.0]
+    )
+    assert split_indices.tolist() == [2, 5]
+
+
+def test_simulate_queue_with_several_sequences_matches_merged_sequence():
+    random_number_generator = np.random.default_rng(0)
+    sequences = []
+    for pitch in range(3):
+        instances = np.sort(random_number_generator.uniform(0, 20, 50)).round(1)
+        durations = random_number_generator.exponential(0.5, 50).tolist()
+        sequences.append(
+            pang.Sequence(
+                to_sound_points(instances.tolist(), durations, [pitch] * 50), 20
+            )
+        )
+    servers, service_log = pang.simulate_queue_with_service_log(
+        tuple(sequences), (pang.NoteServer(), pang.NoteServer())
+    )
+    sound_points = sorted(
+        (sound_point for sequence in sequences for sound_point in sequence),
+        key=lambda sound_point: sound_point.instance,
+    )
+    merged_servers = pang.simulate_queue(
+        pang.Sequence(sound_points, 20), (pang.NoteServer(), pang.NoteServer())
+    )
+    for server, merged_server in zip(servers, merged_servers):
+        assert server.durations == merged_server.durations
+        assert server.pitches == merged_server.pitches
+    for source in range(3):
+        source_service_log = service_log.for_source(source)
+        assert len(source_service_log) == 50
+        assert source_service_log.arrivals.tolist() == sequences[source].instances
+
+
+@pytest.mark.parametrize("number_of_servers", [1, 3])
+def test_simulate_queue_keeps_sparse_attachments(number_of_servers):
+    sequence = pang.Sequence(make_random_sound_points(0), 20)
+    sequence.update_attachments({0: ["a"], 57: ["b"], 199: ["c"]})
+
+    reference_servers = pang.simulate_queue(
+        sequence,
+        tuple(pang.NoteServer() for _ in range(number_of_servers)),
+        pang.SimulationMode.REFERENCE,
+    )
+    servers = pang.simulate_queue(
+        sequence, tuple(pang.NoteServer() for _ in range(number_of_servers))
+    )
+    for reference_server, server in zip(reference_servers, servers):
+        assert server.sparse_attachments == reference_server.sparse_attachments
+        assert server.attachments == reference_server.attachments
+    assert sorted(
+        attachments
+        for server in servers
+        for attachments in server.sparse_attachments.values()
+    ) == [["a"], ["b"], ["c"]]
+
+
+def test_simulate_queue_single_server_with_touching_notes_matches_reference_mode():
+    random_number_generator = np.random.default_rng(1)
+    durations = random_number_generator.exponential(0.3, 2000)
+    gaps = np.where(
+        random_number_generator.random(2000) < 0.1,
+        random_number_generator.exponential(0.2, 2000),
+        0.0,
+    )
+    instances = []
+    instance = 0.0
+    for duration, gap in zip(durations.tolist(), gaps.tolist()):
+        instances.append(instance)
+        instance = instance + duration + gap
+    sequence = pang.Sequence.from_arrays(instances, durations, instance)
+
+    (reference_server,) = pang.simulate_queue(
+        sequence, (pang.NoteServer(),), pang.SimulationMode.REFERENCE
+    )
+    (server,) = pang.simulate_queue(sequence, (pang.NoteServer(),))
+    assert server.durations == reference_server.durations
+    assert server.pitches == reference_server.pitches
+    assert server.offset_instance == reference_server.offset_instance
+
+
+class CountingNoteServer(pang.NoteServer):
+    def __init__(self):
+        super().__init__()
+        self.number_of_served_sound_points = 0
+
+    def serve(self, curr_time, sound_point):
+        self.number_of_served_sound_points += 1
+        super().serve(curr_time, sound_point)
+
+
+@pytest.mark.parametrize("number_of_servers", [1, 3])
+def test_simulate_queue_calls_overridden_serve(number_of_servers):
+    sequence = pang.Sequence(
+        to_sound_points([0, 0.5, 1, 3], [1, 1, 1, 1], [0, 1, 2, 3]), 4
+    )
+    reference_servers = pang.simulate_queue(
+        sequence,
+        tuple(pang.NoteServer() for _ in range(number_of_servers)),
+        pang.SimulationMode.REFERENCE,
+    )
+    servers = pang.simulate_queue(
+        sequence, tuple(CountingNoteServer() for _ in range(number_of_servers))
+    )
+    assert sum(server.number_of_served_sound_points for server in servers) == len(
+        sequence
+    )
+    for reference_server, server in zip(reference_servers, servers):
+        assert server.durations == reference_server.durations
+        assert server.pitches == reference_server.pitches
+
+
+@pytest.mark.parametrize("number_of_servers", [1, 3])
+def test_simulate_queue_parallel_mode_with_identical_servers(number_of_servers):
+    sequence = pang.Sequence(make_random_sound_points(0, 300, 100), 100)
+    event_driven_servers = pang.simulate_queue(
+        sequence, tuple(pang.NoteServer() for _ in range(number_of_servers))
+    )
+    parallel_servers = pang.simulate_queue(
+        sequence,
+        tuple(pang.NoteServer() for _ in range(number_of_servers)),
+        pang.SimulationMode.PARALLEL,
+    )
+    for parallel_server, event_driven_server in zip(
+        parallel_servers, event_driven_servers
+    ):
+        assert parallel_server.durations == event_driven_server.durations
+
+
+def test_simulate_queue_with_no_sequences():
+    servers = (pang.NoteServer(),)
+    assert pang.simulate_queue((), servers) is servers
+    assert servers[0].is_empty
+    _, service_log = pang.simulate_queue_with_service_log((), servers)
+    assert service_log.sources.tolist() == []
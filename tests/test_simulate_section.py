@@ -0,0 +1,86 @@
+import json
+
+import numpy as np
+import pytest
+
+import abjad
+import pang
+
+from .utils import to_sound_points
+
+
+def _get_note_starts(server, offset=0):
+    starts = []
+    for duration, pitch in zip(server.durations, server.pitches):
+        if pitch is not None:
+            starts.append((offset, pitch))
+        offset += duration
+    return starts
+
+
+@pytest.mark.parametrize("number_of_servers", [1, 2, 3])
+def test_simulate_section_continues_queue_across_sections(number_of_servers):
+    random_number_generator = np.random.default_rng(number_of_servers)
+    instances = np.sort(random_number_generator.uniform(0, 8, 40)).tolist()
+    durations = random_number_generator.exponential(0.5, 40).tolist()
+    sound_points = to_sound_points(instances, durations, list(range(40)))
+    whole_servers = tuple(pang.NoteServer() for _ in range(number_of_servers))
+    pang.simulate_queue(pang.Sequence(sound_points, 8), whole_servers)
+    first_section = pang.Sequence(
+        [sound_point for sound_point in sound_points if sound_point.instance < 4], 4
+    )
+    second_section = pang.Sequence(
+        [
+            pang.SoundPoint.from_sound_point(
+                sound_point, instance=sound_point.instance - 4
+            )
+            for sound_point in sound_points
+            if sound_point.instance >= 4
+        ],
+        4,
+    )
+    first_servers = tuple(pang.NoteServer() for _ in range(number_of_servers))
+    queue_state = pang.simulate_section(first_section, first_servers)
+    queue_state = pang.QueueState.from_dict(
+        json.loads(json.dumps(queue_state.asdict()))
+    )
+    second_servers = tuple(pang.NoteServer() for _ in range(number_of_servers))
+    pang.simulate_section(second_section, second_servers, queue_state)
+    for whole, first, second in zip(whole_servers, first_servers, second_servers):
+        note_starts = _get_note_starts(first) + _get_note_starts(second, 4)
+        served_pitches = [pitch for _, pitch in note_starts]
+        expected = [
+            note_start
+            for note_start in _get_note_starts(whole)
+            if note_start[1] in served_pitches
+        ]
+        assert [pitch for _, pitch in note_starts] == [pitch for _, pitch in expected]
+        assert [start for start, _ in note_starts] == pytest.approx(
+            [start for start, _ in expected]
+        )
+
+
+def test_queue_state_round_trips_through_dict():
+    queue_state = pang.QueueState(
+        (0.5, 0.0),
+        (pang.SoundPoint(-1.5, 1, (60, 64), ["a"]), pang.SoundPoint(-1, 2, 62)),
+    )
+    assert pang.QueueState.from_dict(queue_state.asdict()) == queue_state
+
+
+def test_queue_state_round_trips_abjad_indicators_through_json():
+    queue_state = pang.QueueState(
+        (0.5,), (pang.SoundPoint(-1.5, 1, 60, [abjad.Dynamic("p")]),)
+    )
+    assert (
+        pang.QueueState.from_dict(json.loads(json.dumps(queue_state.asdict())))
+        == queue_state
+    )
+
+
+def test_simulate_section_raises_exception_on_mismatched_state():
+    sequence = pang.Sequence(to_sound_points([0, 1], [1, 1]), 2)
+    with pytest.raises(ValueError):
+        pang.simulate_section(
+            sequence, (pang.NoteServer(),), pang.QueueState((0.0, 0.0))
+        )
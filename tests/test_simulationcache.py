@@ -0,0 +1,164 @@
+import sys
+import types
+
+import numpy as np
+import pytest
+
+import pang
+
+from .utils import to_sound_points
+
+
+def _make_sequence(pitches):
+    return pang.Sequence(
+        to_sound_points([0, 0.5, 1, 1.25], [1, 1, 0.5, 0.5], pitches), 2
+    )
+
+
+def test_simulate_queue_replays_cached_simulation(tmp_path, monkeypatch):
+    sequence = _make_sequence([0, 1, 2, 3])
+    servers = pang.simulate_queue(
+        sequence, (pang.NoteServer(), pang.NoteServer()), cache_directory=tmp_path
+    )
+
+    def fail(*arguments, **keywords):
+        raise AssertionError("The simulation should have been cached")
+
+    monkeypatch.setattr(pang.queuesimulation, "_simulate_queue", fail)
+    cached_servers = pang.simulate_queue(
+        sequence, (pang.NoteServer(), pang.NoteServer()), cache_directory=tmp_path
+    )
+    for server, cached_server in zip(servers, cached_servers):
+        assert server.durations == cached_server.durations
+        assert server.pitches == cached_server.pitches
+        assert server.attachments == cached_server.attachments
+        assert server.offset_instance == cached_server.offset_instance
+
+
+@pytest.mark.parametrize(
+    "servers, other_servers",
+    [
+        ((pang.NoteServer(),), (pang.NoteServer(), pang.NoteServer())),
+        ((pang.RangeNoteServer(0, 12),), (pang.RangeNoteServer(0, 24),)),
+        ((pang.NoteServer(),), (pang.RangeNoteServer(0, 12),)),
+    ],
+)
+def test_simulation_key_depends_on_servers(servers, other_servers):
+    sequence = _make_sequence([0, 1, 2, 3])
+    assert pang.simulationcache.get_simulation_key(
+        sequence, servers
+    ) != pang.simulationcache.get_simulation_key(sequence, other_servers)
+
+
+def test_simulation_key_depends_on_sequence():
+    servers = (pang.NoteServer(),)
+    assert pang.simulationcache.get_simulation_key(
+        _make_sequence([0, 1, 2, 3]), servers
+    ) != pang.simulationcache.get_simulation_key(_make_sequence([0, 1, 2, 4]), servers)
+    assert pang.simulationcache.get_simulation_key(
+        _make_sequence([0, 1, 2, 3]), servers
+    ) == pang.simulationcache.get_simulation_key(_make_sequence([0, 1, 2, 3]), servers)
+
+
+_LOWEST_PITCH = 2
+
+
+class _GlobalNoteServer(pang.NoteServer):
+    def can_serve(self, sound_point):
+        return sound_point.pitch >= _LOWEST_PITCH
+
+
+class _ManyNoteServer(pang.NoteServer):
+    def can_serve_many(self, sequence):
+        return np.ones(len(sequence), dtype=bool)
+
+
+class _OtherManyNoteServer(pang.NoteServer):
+    def can_serve_many(self, sequence):
+        return np.zeros(len(sequence), dtype=bool)
+
+
+def test_simulation_key_depends_on_globals_read(monkeypatch):
+    sequence = _make_sequence([0, 1, 2, 3])
+    key = pang.simulationcache.get_simulation_key(sequence, (_GlobalNoteServer(),))
+    monkeypatch.setattr(sys.modules[__name__], "_LOWEST_PITCH", 3)
+    assert key is not None
+    assert key != pang.simulationcache.get_simulation_key(
+        sequence, (_GlobalNoteServer(),)
+    )
+
+
+def test_simulation_key_depends_on_can_serve_many(monkeypatch):
+    sequence = _make_sequence([0, 1, 2, 3])
+    key = pang.simulationcache.get_simulation_key(sequence, (_ManyNoteServer(),))
+    monkeypatch.setattr(
+        _ManyNoteServer, "can_serve_many", _OtherManyNoteServer.can_serve_many
+    )
+    assert key != pang.simulationcache.get_simulation_key(
+        sequence, (_ManyNoteServer(),)
+    )
+
+
+def test_simulation_key_depends_on_content_of_closure_variables():
+    pitches = {0, 1}
+
+    class SetNoteServer(pang.NoteServer):
+        def can_serve(self, sound_point):
+            return sound_point.pitch in pitches
+
+    sequence = _make_sequence([0, 1, 2, 3])
+    key = pang.simulationcache.get_simulation_key(sequence, (SetNoteServer(),))
+    pitches.add(2)
+    assert key is not None
+    assert key != pang.simulationcache.get_simulation_key(sequence, (SetNoteServer(),))
+
+
+def test_simulate_queue_does_not_cache_unkeyable_servers(tmp_path):
+    limits = types.SimpleNamespace(highest_pitch=1)
+
+    class LimitNoteServer(pang.NoteServer):
+        def can_serve(self, sound_point):
+            return sound_point.pitch <= limits.highest_pitch
+
+    sequence = _make_sequence([0, 1, 2, 3])
+    assert (
+        pang.simulationcache.get_simulation_key(sequence, (LimitNoteServer(),)) is None
+    )
+    servers = pang.simulate_queue(
+        sequence, (LimitNoteServer(), pang.NoteServer()), cache_directory=tmp_path
+    )
+    assert servers[0].pitches == [0]
+    assert not list(tmp_path.iterdir())
+
+
+class _HelperNoteServer(pang.NoteServer):
+    def can_serve(self, sound_point):
+        return self.is_low(sound_point.pitch)
+
+    def is_low(self, pitch):
+        return pitch < 5
+
+
+def test_simulate_queue_does_not_replay_after_a_helper_changes(tmp_path, monkeypatch):
+    sequence = pang.Sequence(to_sound_points([0, 1], [1, 1], [0, 7]), 2)
+    servers = pang.simulate_queue(
+        sequence, (_HelperNoteServer(), pang.NoteServer()), cache_directory=tmp_path
+    )
+    assert [server.pitches for server in servers] == [[0], [None, 7]]
+    monkeypatch.setattr(_HelperNoteServer, "is_low", lambda self, pitch: pitch < 10)
+    servers = pang.simulate_queue(
+        sequence, (_HelperNoteServer(), pang.NoteServer()), cache_directory=tmp_path
+    )
+    assert [server.pitches for server in servers] == [[0, 7], []]
+
+
+def test_write_simulation_removes_temporary_file_on_failure(tmp_path, monkeypatch):
+    def fail(*arguments, **keywords):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(pang.simulationcache.np, "savez", fail)
+    with pytest.raises(OSError):
+        pang.simulationcache.write_simulation(
+            tmp_path, "key", np.zeros(2), np.zeros(2, dtype=int)
+        )
+    assert not list(tmp_path.iterdir())
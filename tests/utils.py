@@ -1,3 +1,5 @@
+import numpy as np
+
 import pang
 
 
@@ -8,3 +10,17 @@ def to_sound_points(instances, durations, pitches=None):
         pang.SoundPoint(instance, duration, pitch)
         for instance, duration, pitch in zip(instances, durations, pitches)
     ]
+
+
+def make_random_sound_points(
+    seed, number_of_sound_points=200, sequence_duration=20, mean_duration=0.5
+):
+    random_number_generator = np.random.default_rng(seed)
+    instances = np.sort(
+        random_number_generator.uniform(0, sequence_duration, number_of_sound_points)
+    ).tolist()
+    durations = random_number_generator.exponential(
+        mean_duration, number_of_sound_points
+    ).tolist()
+    pitches = random_number_generator.integers(0, 12, number_of_sound_points).tolist()
+    return to_sound_points(instances, durations, pitches)